@@ -5,17 +5,433 @@ d = { 'settings': { 'branch': 'main',
                 'doc_host': 'https://Fewsats.github.io',
                 'git_url': 'https://github.com/Fewsats/agora-l402',
                 'lib_path': 'agora_l402'},
-  'syms': { 'agora_l402.core': { 'agora_l402.core.Agora': ('core.html#agora', 'agora_l402/core.py'),
-                                 'agora_l402.core.Agora.__init__': ('core.html#agora.__init__', 'agora_l402/core.py'),
+  'syms': { 'agora_l402.auth': { 'agora_l402.auth.CredentialManager': ('auth.html#credentialmanager', 'agora_l402/auth.py'),
+                                 'agora_l402.auth.CredentialManager.__init__': ( 'auth.html#credentialmanager.__init__',
+                                                                                 'agora_l402/auth.py'),
+                                 'agora_l402.auth.CredentialManager._adopt': ('auth.html#credentialmanager._adopt', 'agora_l402/auth.py'),
+                                 'agora_l402.auth.CredentialManager._claim': ('auth.html#credentialmanager._claim', 'agora_l402/auth.py'),
+                                 'agora_l402.auth.CredentialManager._task_done': ( 'auth.html#credentialmanager._task_done',
+                                                                                   'agora_l402/auth.py'),
+                                 'agora_l402.auth.CredentialManager.api_key': ('auth.html#credentialmanager.api_key', 'agora_l402/auth.py'),
+                                 'agora_l402.auth.CredentialManager.arefresh': ( 'auth.html#credentialmanager.arefresh',
+                                                                                 'agora_l402/auth.py'),
+                                 'agora_l402.auth.CredentialManager.arefresh_in_background': ( 'auth.html#credentialmanager.arefresh_in_background',
+                                                                                               'agora_l402/auth.py'),
+                                 'agora_l402.auth.CredentialManager.can_refresh': ( 'auth.html#credentialmanager.can_refresh',
+                                                                                    'agora_l402/auth.py'),
+                                 'agora_l402.auth.CredentialManager.due': ('auth.html#credentialmanager.due', 'agora_l402/auth.py'),
+                                 'agora_l402.auth.CredentialManager.expires_in': ( 'auth.html#credentialmanager.expires_in',
+                                                                                   'agora_l402/auth.py'),
+                                 'agora_l402.auth.CredentialManager.refresh': ('auth.html#credentialmanager.refresh', 'agora_l402/auth.py'),
+                                 'agora_l402.auth.CredentialManager.refresh_in_background': ( 'auth.html#credentialmanager.refresh_in_background',
+                                                                                              'agora_l402/auth.py'),
+                                 'agora_l402.auth.CredentialManager.set': ('auth.html#credentialmanager.set', 'agora_l402/auth.py'),
+                                 'agora_l402.auth.FileCredentialStore': ('auth.html#filecredentialstore', 'agora_l402/auth.py'),
+                                 'agora_l402.auth.FileCredentialStore.__init__': ( 'auth.html#filecredentialstore.__init__',
+                                                                                   'agora_l402/auth.py'),
+                                 'agora_l402.auth.FileCredentialStore.alock': ('auth.html#filecredentialstore.alock', 'agora_l402/auth.py'),
+                                 'agora_l402.auth.FileCredentialStore.load': ('auth.html#filecredentialstore.load', 'agora_l402/auth.py'),
+                                 'agora_l402.auth.FileCredentialStore.lock': ('auth.html#filecredentialstore.lock', 'agora_l402/auth.py'),
+                                 'agora_l402.auth.FileCredentialStore.save': ('auth.html#filecredentialstore.save', 'agora_l402/auth.py'),
+                                 'agora_l402.auth._anolock': ('auth.html#_anolock', 'agora_l402/auth.py'),
+                                 'agora_l402.auth._epoch': ('auth.html#_epoch', 'agora_l402/auth.py'),
+                                 'agora_l402.auth._nolock': ('auth.html#_nolock', 'agora_l402/auth.py'),
+                                 'agora_l402.auth._to_dict': ('auth.html#_to_dict', 'agora_l402/auth.py')},
+            'agora_l402.cache': { 'agora_l402.cache.MemoryBackend': ('cache.html#memorybackend', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.MemoryBackend.__init__': ('cache.html#memorybackend.__init__', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.MemoryBackend.__len__': ('cache.html#memorybackend.__len__', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.MemoryBackend.clear': ('cache.html#memorybackend.clear', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.MemoryBackend.get': ('cache.html#memorybackend.get', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.MemoryBackend.set': ('cache.html#memorybackend.set', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.ResponseCache': ('cache.html#responsecache', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.ResponseCache.__init__': ('cache.html#responsecache.__init__', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.ResponseCache.aget': ('cache.html#responsecache.aget', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.ResponseCache.aset': ('cache.html#responsecache.aset', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.ResponseCache.clear': ('cache.html#responsecache.clear', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.ResponseCache.get': ('cache.html#responsecache.get', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.ResponseCache.key': ('cache.html#responsecache.key', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.ResponseCache.set': ('cache.html#responsecache.set', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.ResponseCache.stats': ('cache.html#responsecache.stats', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.SQLiteBackend': ('cache.html#sqlitebackend', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.SQLiteBackend.__init__': ('cache.html#sqlitebackend.__init__', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.SQLiteBackend.__len__': ('cache.html#sqlitebackend.__len__', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.SQLiteBackend.clear': ('cache.html#sqlitebackend.clear', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.SQLiteBackend.get': ('cache.html#sqlitebackend.get', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.SQLiteBackend.set': ('cache.html#sqlitebackend.set', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.SingleFlight': ('cache.html#singleflight', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.SingleFlight.__init__': ('cache.html#singleflight.__init__', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.SingleFlight._done': ('cache.html#singleflight._done', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.SingleFlight.ado': ('cache.html#singleflight.ado', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.SingleFlight.do': ('cache.html#singleflight.do', 'agora_l402/cache.py'),
+                                  'agora_l402.cache._decode': ('cache.html#_decode', 'agora_l402/cache.py'),
+                                  'agora_l402.cache._encode': ('cache.html#_encode', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.offload': ('cache.html#offload', 'agora_l402/cache.py'),
+                                  'agora_l402.cache.request_key': ('cache.html#request_key', 'agora_l402/cache.py')},
+            'agora_l402.cart': { 'agora_l402.cart.Carts': ('cart.html#carts', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.Carts.__init__': ('cart.html#carts.__init__', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.Carts._done': ('cart.html#carts._done', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.Carts._enqueue': ('cart.html#carts._enqueue', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.Carts._sent': ('cart.html#carts._sent', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.Carts._take': ('cart.html#carts._take', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.Carts.aadd': ('cart.html#carts.aadd', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.Carts.add': ('cart.html#carts.add', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.Carts.get': ('cart.html#carts.get', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.Carts.update': ('cart.html#carts.update', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.LocalCart': ('cart.html#localcart', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.LocalCart.__init__': ('cart.html#localcart.__init__', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.LocalCart.__repr__': ('cart.html#localcart.__repr__', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.LocalCart.add': ('cart.html#localcart.add', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.LocalCart.count': ('cart.html#localcart.count', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.LocalCart.items': ('cart.html#localcart.items', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.LocalCart.merged': ('cart.html#localcart.merged', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.LocalCart.replace': ('cart.html#localcart.replace', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.LocalCart.to_dict': ('cart.html#localcart.to_dict', 'agora_l402/cart.py'),
+                                 'agora_l402.cart.LocalCart.total': ('cart.html#localcart.total', 'agora_l402/cart.py'),
+                                 'agora_l402.cart._key': ('cart.html#_key', 'agora_l402/cart.py'),
+                                 'agora_l402.cart._merge': ('cart.html#_merge', 'agora_l402/cart.py')},
+            'agora_l402.cassette': { 'agora_l402.cassette.Cassette': ('cassette.html#cassette', 'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.Cassette.__init__': ('cassette.html#cassette.__init__', 'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.Cassette.__len__': ('cassette.html#cassette.__len__', 'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.Cassette._read': ('cassette.html#cassette._read', 'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.Cassette._scan': ('cassette.html#cassette._scan', 'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.Cassette.close': ('cassette.html#cassette.close', 'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.Cassette.get': ('cassette.html#cassette.get', 'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.Cassette.key': ('cassette.html#cassette.key', 'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.Cassette.put': ('cassette.html#cassette.put', 'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.CassetteMiss': ('cassette.html#cassettemiss', 'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.CassetteTransport': ('cassette.html#cassettetransport', 'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.CassetteTransport.__init__': ( 'cassette.html#cassettetransport.__init__',
+                                                                                         'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.CassetteTransport._replay': ( 'cassette.html#cassettetransport._replay',
+                                                                                        'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.CassetteTransport.aclose': ( 'cassette.html#cassettetransport.aclose',
+                                                                                       'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.CassetteTransport.close': ( 'cassette.html#cassettetransport.close',
+                                                                                      'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.CassetteTransport.handle_async_request': ( 'cassette.html#cassettetransport.handle_async_request',
+                                                                                                     'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.CassetteTransport.handle_request': ( 'cassette.html#cassettetransport.handle_request',
+                                                                                               'agora_l402/cassette.py'),
+                                     'agora_l402.cassette._body_digest': ('cassette.html#_body_digest', 'agora_l402/cassette.py'),
+                                     'agora_l402.cassette.use_cassette': ('cassette.html#use_cassette', 'agora_l402/cassette.py')},
+            'agora_l402.core': { 'agora_l402.core.Agora': ('core.html#agora', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora.__enter__': ('core.html#agora.__enter__', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora.__exit__': ('core.html#agora.__exit__', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora._attempt': ('core.html#agora._attempt', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora._check_credentials': ('core.html#agora._check_credentials', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora._new_credentials': ('core.html#agora._new_credentials', 'agora_l402/core.py'),
                                  'agora_l402.core.Agora._request': ('core.html#agora._request', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora._send': ('core.html#agora._send', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora.add_items': ('core.html#agora.add_items', 'agora_l402/core.py'),
                                  'agora_l402.core.Agora.add_to_cart': ('core.html#agora.add_to_cart', 'agora_l402/core.py'),
-                                 'agora_l402.core.Agora.as_tools': ('core.html#agora.as_tools', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora.close': ('core.html#agora.close', 'agora_l402/core.py'),
                                  'agora_l402.core.Agora.create_cart': ('core.html#agora.create_cart', 'agora_l402/core.py'),
                                  'agora_l402.core.Agora.create_order': ('core.html#agora.create_order', 'agora_l402/core.py'),
                                  'agora_l402.core.Agora.create_payment_intent': ( 'core.html#agora.create_payment_intent',
                                                                                   'agora_l402/core.py'),
+                                 'agora_l402.core.Agora.create_payment_intents': ( 'core.html#agora.create_payment_intents',
+                                                                                   'agora_l402/core.py'),
                                  'agora_l402.core.Agora.get_product_detail': ('core.html#agora.get_product_detail', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora.get_product_details': ('core.html#agora.get_product_details', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora.image_search': ('core.html#agora.image_search', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora.iter_search': ('core.html#agora.iter_search', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora.local_search': ('core.html#agora.local_search', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora.multi_search': ('core.html#agora.multi_search', 'agora_l402/core.py'),
                                  'agora_l402.core.Agora.refresh_token': ('core.html#agora.refresh_token', 'agora_l402/core.py'),
                                  'agora_l402.core.Agora.search_trial': ('core.html#agora.search_trial', 'agora_l402/core.py'),
                                  'agora_l402.core.Agora.text_search': ('core.html#agora.text_search', 'agora_l402/core.py'),
-                                 'agora_l402.core.Agora.track_order': ('core.html#agora.track_order', 'agora_l402/core.py')}}}
+                                 'agora_l402.core.Agora.track_order': ('core.html#agora.track_order', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora.upload_image': ('core.html#agora.upload_image', 'agora_l402/core.py'),
+                                 'agora_l402.core.Agora.watch_orders': ('core.html#agora.watch_orders', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora': ('core.html#asyncagora', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.__aenter__': ('core.html#asyncagora.__aenter__', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.__aexit__': ('core.html#asyncagora.__aexit__', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.__init__': ('core.html#asyncagora.__init__', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora._attempt': ('core.html#asyncagora._attempt', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora._check_credentials': ( 'core.html#asyncagora._check_credentials',
+                                                                                    'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora._new_credentials': ( 'core.html#asyncagora._new_credentials',
+                                                                                  'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora._request': ('core.html#asyncagora._request', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora._send': ('core.html#asyncagora._send', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora._write': ('core.html#asyncagora._write', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora._write_done': ('core.html#asyncagora._write_done', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.aclose': ('core.html#asyncagora.aclose', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.add_items': ('core.html#asyncagora.add_items', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.add_to_cart': ('core.html#asyncagora.add_to_cart', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.create_cart': ('core.html#asyncagora.create_cart', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.create_order': ('core.html#asyncagora.create_order', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.create_payment_intent': ( 'core.html#asyncagora.create_payment_intent',
+                                                                                       'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.create_payment_intents': ( 'core.html#asyncagora.create_payment_intents',
+                                                                                        'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.get_product_detail': ( 'core.html#asyncagora.get_product_detail',
+                                                                                    'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.get_product_details': ( 'core.html#asyncagora.get_product_details',
+                                                                                     'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.image_search': ('core.html#asyncagora.image_search', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.iter_search': ('core.html#asyncagora.iter_search', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.local_search': ('core.html#asyncagora.local_search', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.multi_search': ('core.html#asyncagora.multi_search', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.refresh_token': ('core.html#asyncagora.refresh_token', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.search_trial': ('core.html#asyncagora.search_trial', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.text_search': ('core.html#asyncagora.text_search', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.track_order': ('core.html#asyncagora.track_order', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.upload_image': ('core.html#asyncagora.upload_image', 'agora_l402/core.py'),
+                                 'agora_l402.core.AsyncAgora.watch_orders': ('core.html#asyncagora.watch_orders', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase': ('core.html#_agorabase', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase.__init__': ('core.html#_agorabase.__init__', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase._build_request': ('core.html#_agorabase._build_request', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase._cache_key': ('core.html#_agorabase._cache_key', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase._create_offers': ('core.html#_agorabase._create_offers', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase._indexed': ('core.html#_agorabase._indexed', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase._refreshable': ('core.html#_agorabase._refreshable', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase._span': ('core.html#_agorabase._span', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase._store_credentials': ( 'core.html#_agorabase._store_credentials',
+                                                                                    'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase._use_key': ('core.html#_agorabase._use_key', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase.as_tools': ('core.html#_agorabase.as_tools', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase.fewsats': ('core.html#_agorabase.fewsats', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase.local_cart': ('core.html#_agorabase.local_cart', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase.orders': ('core.html#_agorabase.orders', 'agora_l402/core.py'),
+                                 'agora_l402.core._AgoraBase.stats': ('core.html#_agorabase.stats', 'agora_l402/core.py'),
+                                 'agora_l402.core._cut_short': ('core.html#_cut_short', 'agora_l402/core.py'),
+                                 'agora_l402.core._endpoint': ('core.html#_endpoint', 'agora_l402/core.py'),
+                                 'agora_l402.core._image_files': ('core.html#_image_files', 'agora_l402/core.py'),
+                                 'agora_l402.core._image_id': ('core.html#_image_id', 'agora_l402/core.py'),
+                                 'agora_l402.core._merged': ('core.html#_merged', 'agora_l402/core.py'),
+                                 'agora_l402.core._offer': ('core.html#_offer', 'agora_l402/core.py'),
+                                 'agora_l402.core._page_products': ('core.html#_page_products', 'agora_l402/core.py'),
+                                 'agora_l402.core._pool_kwargs': ('core.html#_pool_kwargs', 'agora_l402/core.py'),
+                                 'agora_l402.core._results_page': ('core.html#_results_page', 'agora_l402/core.py'),
+                                 'agora_l402.core._search_params': ('core.html#_search_params', 'agora_l402/core.py'),
+                                 'agora_l402.core._stale_key': ('core.html#_stale_key', 'agora_l402/core.py')},
+            'agora_l402.deadline': { 'agora_l402.deadline.DeadlineExceeded': ('deadline.html#deadlineexceeded', 'agora_l402/deadline.py'),
+                                     'agora_l402.deadline.DeadlineExceeded.__init__': ( 'deadline.html#deadlineexceeded.__init__',
+                                                                                        'agora_l402/deadline.py'),
+                                     'agora_l402.deadline.bounded': ('deadline.html#bounded', 'agora_l402/deadline.py'),
+                                     'agora_l402.deadline.check': ('deadline.html#check', 'agora_l402/deadline.py'),
+                                     'agora_l402.deadline.clip_timeout': ('deadline.html#clip_timeout', 'agora_l402/deadline.py'),
+                                     'agora_l402.deadline.deadline': ('deadline.html#deadline', 'agora_l402/deadline.py'),
+                                     'agora_l402.deadline.fits': ('deadline.html#fits', 'agora_l402/deadline.py'),
+                                     'agora_l402.deadline.in_context': ('deadline.html#in_context', 'agora_l402/deadline.py'),
+                                     'agora_l402.deadline.no_deadline': ('deadline.html#no_deadline', 'agora_l402/deadline.py'),
+                                     'agora_l402.deadline.remaining': ('deadline.html#remaining', 'agora_l402/deadline.py'),
+                                     'agora_l402.deadline.within': ('deadline.html#within', 'agora_l402/deadline.py')},
+            'agora_l402.fanout': { 'agora_l402.fanout.dedupe': ('fanout.html#dedupe', 'agora_l402/fanout.py'),
+                                   'agora_l402.fanout.interleave': ('fanout.html#interleave', 'agora_l402/fanout.py'),
+                                   'agora_l402.fanout.merge_products': ('fanout.html#merge_products', 'agora_l402/fanout.py')},
+            'agora_l402.images': { 'agora_l402.images.ImageIds': ('images.html#imageids', 'agora_l402/images.py'),
+                                   'agora_l402.images.ImageIds.__init__': ('images.html#imageids.__init__', 'agora_l402/images.py'),
+                                   'agora_l402.images.ImageIds._prepare': ('images.html#imageids._prepare', 'agora_l402/images.py'),
+                                   'agora_l402.images.ImageIds._upload': ('images.html#imageids._upload', 'agora_l402/images.py'),
+                                   'agora_l402.images.ImageIds.aupload': ('images.html#imageids.aupload', 'agora_l402/images.py'),
+                                   'agora_l402.images.ImageIds.get': ('images.html#imageids.get', 'agora_l402/images.py'),
+                                   'agora_l402.images.ImageIds.key': ('images.html#imageids.key', 'agora_l402/images.py'),
+                                   'agora_l402.images.ImageIds.upload': ('images.html#imageids.upload', 'agora_l402/images.py'),
+                                   'agora_l402.images._allowed': ('images.html#_allowed', 'agora_l402/images.py'),
+                                   'agora_l402.images.check_image': ('images.html#check_image', 'agora_l402/images.py'),
+                                   'agora_l402.images.content_type': ('images.html#content_type', 'agora_l402/images.py'),
+                                   'agora_l402.images.downscale': ('images.html#downscale', 'agora_l402/images.py'),
+                                   'agora_l402.images.open_image': ('images.html#open_image', 'agora_l402/images.py')},
+            'agora_l402.index': { 'agora_l402.index.ProductIndex': ('index.html#productindex', 'agora_l402/index.py'),
+                                  'agora_l402.index.ProductIndex.__init__': ('index.html#productindex.__init__', 'agora_l402/index.py'),
+                                  'agora_l402.index.ProductIndex.__len__': ('index.html#productindex.__len__', 'agora_l402/index.py'),
+                                  'agora_l402.index.ProductIndex._put': ('index.html#productindex._put', 'agora_l402/index.py'),
+                                  'agora_l402.index.ProductIndex.add': ('index.html#productindex.add', 'agora_l402/index.py'),
+                                  'agora_l402.index.ProductIndex.clear': ('index.html#productindex.clear', 'agora_l402/index.py'),
+                                  'agora_l402.index.ProductIndex.get': ('index.html#productindex.get', 'agora_l402/index.py'),
+                                  'agora_l402.index.ProductIndex.search': ('index.html#productindex.search', 'agora_l402/index.py'),
+                                  'agora_l402.index._contains': ('index.html#_contains', 'agora_l402/index.py'),
+                                  'agora_l402.index._price': ('index.html#_price', 'agora_l402/index.py'),
+                                  'agora_l402.index._query_key': ('index.html#_query_key', 'agora_l402/index.py'),
+                                  'agora_l402.index._tokens': ('index.html#_tokens', 'agora_l402/index.py'),
+                                  'agora_l402.index.sort_by_price': ('index.html#sort_by_price', 'agora_l402/index.py')},
+            'agora_l402.metrics': { 'agora_l402.metrics.Histogram': ('metrics.html#histogram', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Histogram.__init__': ('metrics.html#histogram.__init__', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Histogram.observe': ('metrics.html#histogram.observe', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Histogram.quantile': ('metrics.html#histogram.quantile', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Instrumentation': ('metrics.html#instrumentation', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Instrumentation.__init__': ( 'metrics.html#instrumentation.__init__',
+                                                                                     'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Instrumentation.cache': ( 'metrics.html#instrumentation.cache',
+                                                                                  'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Instrumentation.end': ('metrics.html#instrumentation.end', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Instrumentation.start': ( 'metrics.html#instrumentation.start',
+                                                                                  'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Metrics': ('metrics.html#metrics', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Metrics.__init__': ('metrics.html#metrics.__init__', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Metrics.record': ('metrics.html#metrics.record', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Metrics.record_cache': ( 'metrics.html#metrics.record_cache',
+                                                                                 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Metrics.snapshot': ('metrics.html#metrics.snapshot', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Metrics.to_prometheus': ( 'metrics.html#metrics.to_prometheus',
+                                                                                  'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Span': ('metrics.html#span', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Span.__init__': ('metrics.html#span.__init__', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Span.__repr__': ('metrics.html#span.__repr__', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.Span.duration': ('metrics.html#span.duration', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics._labels': ('metrics.html#_labels', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics._ms': ('metrics.html#_ms', 'agora_l402/metrics.py'),
+                                    'agora_l402.metrics.otel_span_hook': ('metrics.html#otel_span_hook', 'agora_l402/metrics.py')},
+            'agora_l402.models': { 'agora_l402.models.Cart': ('models.html#cart', 'agora_l402/models.py'),
+                                   'agora_l402.models.Cart.items': ('models.html#cart.items', 'agora_l402/models.py'),
+                                   'agora_l402.models.Credentials': ('models.html#credentials', 'agora_l402/models.py'),
+                                   'agora_l402.models.Credentials.__init__': ('models.html#credentials.__init__', 'agora_l402/models.py'),
+                                   'agora_l402.models.Credentials.__repr__': ('models.html#credentials.__repr__', 'agora_l402/models.py'),
+                                   'agora_l402.models.Order': ('models.html#order', 'agora_l402/models.py'),
+                                   'agora_l402.models.Order.order_id': ('models.html#order.order_id', 'agora_l402/models.py'),
+                                   'agora_l402.models.Product': ('models.html#product', 'agora_l402/models.py'),
+                                   'agora_l402.models.Product.__eq__': ('models.html#product.__eq__', 'agora_l402/models.py'),
+                                   'agora_l402.models.Product.__hash__': ('models.html#product.__hash__', 'agora_l402/models.py'),
+                                   'agora_l402.models.Product.__init__': ('models.html#product.__init__', 'agora_l402/models.py'),
+                                   'agora_l402.models.Product.__repr__': ('models.html#product.__repr__', 'agora_l402/models.py'),
+                                   'agora_l402.models.Product.from_dict': ('models.html#product.from_dict', 'agora_l402/models.py'),
+                                   'agora_l402.models.Product.to_dict': ('models.html#product.to_dict', 'agora_l402/models.py'),
+                                   'agora_l402.models.ProductDetail': ('models.html#productdetail', 'agora_l402/models.py'),
+                                   'agora_l402.models.ProductDetail.__init__': ( 'models.html#productdetail.__init__',
+                                                                                 'agora_l402/models.py'),
+                                   'agora_l402.models.ProductDetail.product': ('models.html#productdetail.product', 'agora_l402/models.py'),
+                                   'agora_l402.models.ProductDetail.variants': ( 'models.html#productdetail.variants',
+                                                                                 'agora_l402/models.py'),
+                                   'agora_l402.models.Result': ('models.html#result', 'agora_l402/models.py'),
+                                   'agora_l402.models.Result.__getattr__': ('models.html#result.__getattr__', 'agora_l402/models.py'),
+                                   'agora_l402.models.Result.__init__': ('models.html#result.__init__', 'agora_l402/models.py'),
+                                   'agora_l402.models.Result.__repr__': ('models.html#result.__repr__', 'agora_l402/models.py'),
+                                   'agora_l402.models.Result.content': ('models.html#result.content', 'agora_l402/models.py'),
+                                   'agora_l402.models.Result.data': ('models.html#result.data', 'agora_l402/models.py'),
+                                   'agora_l402.models.Result.is_success': ('models.html#result.is_success', 'agora_l402/models.py'),
+                                   'agora_l402.models.Result.json': ('models.html#result.json', 'agora_l402/models.py'),
+                                   'agora_l402.models.Result.raise_for_status': ( 'models.html#result.raise_for_status',
+                                                                                  'agora_l402/models.py'),
+                                   'agora_l402.models.Result.response': ('models.html#result.response', 'agora_l402/models.py'),
+                                   'agora_l402.models.Result.status_code': ('models.html#result.status_code', 'agora_l402/models.py'),
+                                   'agora_l402.models.Result.text': ('models.html#result.text', 'agora_l402/models.py'),
+                                   'agora_l402.models.SearchResults': ('models.html#searchresults', 'agora_l402/models.py'),
+                                   'agora_l402.models.SearchResults.__bool__': ( 'models.html#searchresults.__bool__',
+                                                                                 'agora_l402/models.py'),
+                                   'agora_l402.models.SearchResults.__getitem__': ( 'models.html#searchresults.__getitem__',
+                                                                                    'agora_l402/models.py'),
+                                   'agora_l402.models.SearchResults.__init__': ( 'models.html#searchresults.__init__',
+                                                                                 'agora_l402/models.py'),
+                                   'agora_l402.models.SearchResults.__iter__': ( 'models.html#searchresults.__iter__',
+                                                                                 'agora_l402/models.py'),
+                                   'agora_l402.models.SearchResults.__len__': ('models.html#searchresults.__len__', 'agora_l402/models.py'),
+                                   'agora_l402.models.SearchResults.products': ( 'models.html#searchresults.products',
+                                                                                 'agora_l402/models.py'),
+                                   'agora_l402.models.TokenRefresh': ('models.html#tokenrefresh', 'agora_l402/models.py'),
+                                   'agora_l402.models.TokenRefresh.credentials': ( 'models.html#tokenrefresh.credentials',
+                                                                                   'agora_l402/models.py'),
+                                   'agora_l402.models.TokenRefresh.message': ('models.html#tokenrefresh.message', 'agora_l402/models.py'),
+                                   'agora_l402.models.TokenRefresh.status': ('models.html#tokenrefresh.status', 'agora_l402/models.py'),
+                                   'agora_l402.models.Tracking': ('models.html#tracking', 'agora_l402/models.py'),
+                                   'agora_l402.models.Tracking.status': ('models.html#tracking.status', 'agora_l402/models.py')},
+            'agora_l402.payments': { 'agora_l402.payments.PaymentIntents': ('payments.html#paymentintents', 'agora_l402/payments.py'),
+                                     'agora_l402.payments.PaymentIntents.__init__': ( 'payments.html#paymentintents.__init__',
+                                                                                      'agora_l402/payments.py'),
+                                     'agora_l402.payments.PaymentIntents._create': ( 'payments.html#paymentintents._create',
+                                                                                     'agora_l402/payments.py'),
+                                     'agora_l402.payments.PaymentIntents.clear': ( 'payments.html#paymentintents.clear',
+                                                                                   'agora_l402/payments.py'),
+                                     'agora_l402.payments.PaymentIntents.create': ( 'payments.html#paymentintents.create',
+                                                                                    'agora_l402/payments.py'),
+                                     'agora_l402.payments.PaymentIntents.get': ( 'payments.html#paymentintents.get',
+                                                                                 'agora_l402/payments.py'),
+                                     'agora_l402.payments.PaymentIntents.key': ( 'payments.html#paymentintents.key',
+                                                                                 'agora_l402/payments.py')},
+            'agora_l402.ratelimit': { 'agora_l402.ratelimit.MemoryBucketStore': ( 'ratelimit.html#memorybucketstore',
+                                                                                  'agora_l402/ratelimit.py'),
+                                      'agora_l402.ratelimit.MemoryBucketStore.__init__': ( 'ratelimit.html#memorybucketstore.__init__',
+                                                                                           'agora_l402/ratelimit.py'),
+                                      'agora_l402.ratelimit.MemoryBucketStore.take': ( 'ratelimit.html#memorybucketstore.take',
+                                                                                       'agora_l402/ratelimit.py'),
+                                      'agora_l402.ratelimit.RateLimiter': ('ratelimit.html#ratelimiter', 'agora_l402/ratelimit.py'),
+                                      'agora_l402.ratelimit.RateLimiter.__init__': ( 'ratelimit.html#ratelimiter.__init__',
+                                                                                     'agora_l402/ratelimit.py'),
+                                      'agora_l402.ratelimit.RateLimiter._take': ( 'ratelimit.html#ratelimiter._take',
+                                                                                  'agora_l402/ratelimit.py'),
+                                      'agora_l402.ratelimit.RateLimiter._wait': ( 'ratelimit.html#ratelimiter._wait',
+                                                                                  'agora_l402/ratelimit.py'),
+                                      'agora_l402.ratelimit.RateLimiter.aacquire': ( 'ratelimit.html#ratelimiter.aacquire',
+                                                                                     'agora_l402/ratelimit.py'),
+                                      'agora_l402.ratelimit.RateLimiter.acquire': ( 'ratelimit.html#ratelimiter.acquire',
+                                                                                    'agora_l402/ratelimit.py'),
+                                      'agora_l402.ratelimit.SQLiteBucketStore': ( 'ratelimit.html#sqlitebucketstore',
+                                                                                  'agora_l402/ratelimit.py'),
+                                      'agora_l402.ratelimit.SQLiteBucketStore.__init__': ( 'ratelimit.html#sqlitebucketstore.__init__',
+                                                                                           'agora_l402/ratelimit.py'),
+                                      'agora_l402.ratelimit.SQLiteBucketStore.take': ( 'ratelimit.html#sqlitebucketstore.take',
+                                                                                       'agora_l402/ratelimit.py'),
+                                      'agora_l402.ratelimit._reserve': ('ratelimit.html#_reserve', 'agora_l402/ratelimit.py')},
+            'agora_l402.retry': { 'agora_l402.retry.Breakers': ('retry.html#breakers', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.Breakers.__getitem__': ('retry.html#breakers.__getitem__', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.Breakers.__init__': ('retry.html#breakers.__init__', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.Breakers.state': ('retry.html#breakers.state', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.CircuitBreaker': ('retry.html#circuitbreaker', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.CircuitBreaker.__init__': ('retry.html#circuitbreaker.__init__', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.CircuitBreaker.allow': ('retry.html#circuitbreaker.allow', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.CircuitBreaker.record': ('retry.html#circuitbreaker.record', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.CircuitBreaker.release': ('retry.html#circuitbreaker.release', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.CircuitBreaker.retry_in': ('retry.html#circuitbreaker.retry_in', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.CircuitBreaker.snapshot': ('retry.html#circuitbreaker.snapshot', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.CircuitOpenError': ('retry.html#circuitopenerror', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.CircuitOpenError.__init__': ( 'retry.html#circuitopenerror.__init__',
+                                                                                  'agora_l402/retry.py'),
+                                  'agora_l402.retry.RetryPolicy': ('retry.html#retrypolicy', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.RetryPolicy.__init__': ('retry.html#retrypolicy.__init__', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.RetryPolicy.delay': ('retry.html#retrypolicy.delay', 'agora_l402/retry.py'),
+                                  'agora_l402.retry.RetryPolicy.retryable': ('retry.html#retrypolicy.retryable', 'agora_l402/retry.py'),
+                                  'agora_l402.retry._retry_after': ('retry.html#_retry_after', 'agora_l402/retry.py')},
+            'agora_l402.scheduler': { 'agora_l402.scheduler.OverloadedError': ('scheduler.html#overloadederror', 'agora_l402/scheduler.py'),
+                                      'agora_l402.scheduler.OverloadedError.__init__': ( 'scheduler.html#overloadederror.__init__',
+                                                                                         'agora_l402/scheduler.py'),
+                                      'agora_l402.scheduler.PriorityClass': ('scheduler.html#priorityclass', 'agora_l402/scheduler.py'),
+                                      'agora_l402.scheduler.PriorityClass.__init__': ( 'scheduler.html#priorityclass.__init__',
+                                                                                       'agora_l402/scheduler.py'),
+                                      'agora_l402.scheduler.PriorityClass.stats': ( 'scheduler.html#priorityclass.stats',
+                                                                                    'agora_l402/scheduler.py'),
+                                      'agora_l402.scheduler.Scheduler': ('scheduler.html#scheduler', 'agora_l402/scheduler.py'),
+                                      'agora_l402.scheduler.Scheduler.__init__': ( 'scheduler.html#scheduler.__init__',
+                                                                                   'agora_l402/scheduler.py'),
+                                      'agora_l402.scheduler.Scheduler._refuse': ( 'scheduler.html#scheduler._refuse',
+                                                                                  'agora_l402/scheduler.py'),
+                                      'agora_l402.scheduler.Scheduler._shed': ('scheduler.html#scheduler._shed', 'agora_l402/scheduler.py'),
+                                      'agora_l402.scheduler.Scheduler.aslot': ('scheduler.html#scheduler.aslot', 'agora_l402/scheduler.py'),
+                                      'agora_l402.scheduler.Scheduler.class_of': ( 'scheduler.html#scheduler.class_of',
+                                                                                   'agora_l402/scheduler.py'),
+                                      'agora_l402.scheduler.Scheduler.slot': ('scheduler.html#scheduler.slot', 'agora_l402/scheduler.py'),
+                                      'agora_l402.scheduler.Scheduler.stats': ( 'scheduler.html#scheduler.stats',
+                                                                                'agora_l402/scheduler.py')},
+            'agora_l402.shape': { 'agora_l402.shape.Shaper': ('shape.html#shaper', 'agora_l402/shape.py'),
+                                  'agora_l402.shape.Shaper.__call__': ('shape.html#shaper.__call__', 'agora_l402/shape.py'),
+                                  'agora_l402.shape.Shaper.__init__': ('shape.html#shaper.__init__', 'agora_l402/shape.py'),
+                                  'agora_l402.shape.Shaper.product': ('shape.html#shaper.product', 'agora_l402/shape.py'),
+                                  'agora_l402.shape.Shaper.products': ('shape.html#shaper.products', 'agora_l402/shape.py'),
+                                  'agora_l402.shape._size': ('shape.html#_size', 'agora_l402/shape.py'),
+                                  'agora_l402.shape.iter_items': ('shape.html#iter_items', 'agora_l402/shape.py')},
+            'agora_l402.tools': { 'agora_l402.tools._signature': ('tools.html#_signature', 'agora_l402/tools.py'),
+                                  'agora_l402.tools.as_tool': ('tools.html#as_tool', 'agora_l402/tools.py'),
+                                  'agora_l402.tools.register_tools': ('tools.html#register_tools', 'agora_l402/tools.py')},
+            'agora_l402.tracking': { 'agora_l402.tracking.OrderWatcher': ('tracking.html#orderwatcher', 'agora_l402/tracking.py'),
+                                     'agora_l402.tracking.OrderWatcher.__init__': ( 'tracking.html#orderwatcher.__init__',
+                                                                                    'agora_l402/tracking.py'),
+                                     'agora_l402.tracking.OrderWatcher._track': ( 'tracking.html#orderwatcher._track',
+                                                                                  'agora_l402/tracking.py'),
+                                     'agora_l402.tracking.OrderWatcher._update': ( 'tracking.html#orderwatcher._update',
+                                                                                   'agora_l402/tracking.py'),
+                                     'agora_l402.tracking.OrderWatcher.changes': ( 'tracking.html#orderwatcher.changes',
+                                                                                   'agora_l402/tracking.py'),
+                                     'agora_l402.tracking.OrderWatcher.due_in': ( 'tracking.html#orderwatcher.due_in',
+                                                                                  'agora_l402/tracking.py'),
+                                     'agora_l402.tracking.OrderWatcher.poll': ('tracking.html#orderwatcher.poll', 'agora_l402/tracking.py'),
+                                     'agora_l402.tracking.OrderWatcher.take': ('tracking.html#orderwatcher.take', 'agora_l402/tracking.py'),
+                                     'agora_l402.tracking.OrderWatcher.unwatch': ( 'tracking.html#orderwatcher.unwatch',
+                                                                                   'agora_l402/tracking.py'),
+                                     'agora_l402.tracking.OrderWatcher.wait': ('tracking.html#orderwatcher.wait', 'agora_l402/tracking.py'),
+                                     'agora_l402.tracking.OrderWatcher.watch': ( 'tracking.html#orderwatcher.watch',
+                                                                                 'agora_l402/tracking.py'),
+                                     'agora_l402.tracking.OrderWatcher.watching': ( 'tracking.html#orderwatcher.watching',
+                                                                                    'agora_l402/tracking.py'),
+                                     'agora_l402.tracking._Order': ('tracking.html#_order', 'agora_l402/tracking.py'),
+                                     'agora_l402.tracking._Order.__init__': ('tracking.html#_order.__init__', 'agora_l402/tracking.py')},
+            'agora_l402.utils': {'agora_l402.utils.patch': ('utils.html#patch', 'agora_l402/utils.py')}}}
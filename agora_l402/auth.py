@@ -0,0 +1,175 @@
+"""Keep the API key current: refresh before expiry, after a 401, and share it between processes"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/11_auth.ipynb.
+
+# %% auto 0
+__all__ = ['FileCredentialStore', 'CredentialManager']
+
+# %% ../nbs/11_auth.ipynb 3
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+from .models import Credentials
+
+try: import fcntl
+except ImportError: fcntl = None # No cross-process locking on Windows
+
+# %% ../nbs/11_auth.ipynb 5
+def _epoch(expires_at) -> float:
+    "Seconds since the epoch of an `expiresAt` value (ISO 8601 string or number)"
+    if expires_at is None or isinstance(expires_at, (int, float)): return expires_at
+    return datetime.fromisoformat(expires_at.replace('Z', '+00:00')).timestamp()
+
+def _to_dict(c: Credentials) -> dict: return {'apiKey': c.api_key, 'refreshToken': c.refresh_token, 'expiresAt': c.expires_at}
+
+
+class FileCredentialStore:
+    "Credentials in a JSON file shared by the server processes on a host"
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self._lock_path = self.path.with_name(self.path.name + '.lock')
+
+    def load(self) -> Credentials:
+        "Stored credentials, or `None` if there are none yet"
+        try: d = json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError): return None
+        return Credentials(d.get('apiKey'), d.get('refreshToken'), d.get('expiresAt'))
+
+    def save(self, c: Credentials):
+        "Replace the stored credentials, atomically"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name)
+        with os.fdopen(fd, 'w') as f: json.dump(_to_dict(c), f) # mkstemp files are only readable by their owner
+        os.replace(tmp, self.path)
+
+    @contextmanager
+    def lock(self):
+        "Hold the store's lock, across processes"
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None: fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally: os.close(fd)
+
+    @asynccontextmanager
+    async def alock(self):
+        "Hold the store's lock, waiting for it without blocking the event loop"
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            while fcntl is not None:
+                try: fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB); break
+                except BlockingIOError: await asyncio.sleep(0.02)
+            yield
+        finally: os.close(fd)
+
+# %% ../nbs/11_auth.ipynb 7
+class CredentialManager:
+    "Tracks when the API key expires and refreshes it, once, for all the requests that need it"
+    def __init__(self,
+                 refresh_token: str = None, # Refresh token, e.g. from the Agora dashboard
+                 expires_at: str = None, # When the current API key expires, as returned by `refresh_token`
+                 store: FileCredentialStore = None, # Shares credentials with the other processes, read on creation
+                 margin: float = 300): # Seconds before expiry at which to refresh in the background
+        self.credentials = Credentials(None, refresh_token, expires_at)
+        self.store, self.margin = store, margin
+        self.on_change = None # Called with the new credentials, set by the client to update its headers
+        self._lock, self._alock = threading.Lock(), None
+        self._background, self._background_lock = False, threading.Lock()
+        self._task = None # Background refresh running on the event loop, if any
+        stored = store.load() if store is not None else None
+        if stored is not None and stored.api_key: self.credentials = stored
+
+    @property
+    def api_key(self) -> str: return self.credentials.api_key
+
+    @property
+    def can_refresh(self) -> bool: return bool(self.credentials.refresh_token)
+
+    def expires_in(self) -> float:
+        "Seconds until the API key expires, `None` if unknown"
+        t = _epoch(self.credentials.expires_at)
+        return None if t is None else t - time.time()
+
+    def due(self) -> bool:
+        "Whether the key should be refreshed now"
+        left = self.expires_in()
+        return self.can_refresh and left is not None and left < self.margin
+
+    def set(self, c: Credentials):
+        "Use `c` from now on, and store it"
+        self.credentials = c
+        if self.store is not None: self.store.save(c)
+        if self.on_change is not None: self.on_change(c)
+
+    def _adopt(self, stale_key):
+        "Credentials a sibling process stored since `stale_key` was issued, if any"
+        c = self.store.load() if self.store is not None else None
+        if c is None or not c.api_key or c.api_key == stale_key: return None
+        self.credentials = c
+        if self.on_change is not None: self.on_change(c)
+        return c
+
+    def refresh(self,
+                stale_key: str, # The key the caller found wanting
+                refresh: Callable): # `refresh(refresh_token)` returns new `Credentials`
+        "Replace `stale_key`, unless another caller or process already did"
+        with self._lock:
+            if self.api_key != stale_key: return self.credentials
+            with (self.store.lock() if self.store is not None else _nolock()):
+                c = self._adopt(stale_key) or refresh(self.credentials.refresh_token)
+                if c is not self.credentials: self.set(c)
+            return c
+
+    async def arefresh(self, stale_key: str, refresh: Callable):
+        "Replace `stale_key`, awaiting `refresh`. See `CredentialManager.refresh`"
+        if self._alock is None: self._alock = asyncio.Lock()
+        async with self._alock:
+            if self.api_key != stale_key: return self.credentials
+            async with (self.store.alock() if self.store is not None else _anolock()):
+                c = self._adopt(stale_key) or await refresh(self.credentials.refresh_token)
+                if c is not self.credentials: self.set(c)
+            return c
+
+    def _claim(self) -> bool:
+        with self._background_lock:
+            if self._background: return False
+            self._background = True
+            return True
+
+    def refresh_in_background(self, stale_key: str, refresh: Callable):
+        "Start `refresh` on a thread, unless a background refresh is already running"
+        if not self._claim(): return
+        def run():
+            try: self.refresh(stale_key, refresh)
+            except Exception: pass # The key is still valid, the next request tries again
+            finally: self._background = False
+        threading.Thread(target=run, daemon=True).start()
+
+    def arefresh_in_background(self, stale_key: str, refresh: Callable):
+        "Start `refresh` as a task on the running loop, unless a background refresh is already running"
+        if not self._claim(): return
+        async def run():
+            try: await self.arefresh(stale_key, refresh)
+            finally: self._background = False
+        # Referenced until it ends, so the loop can't collect it mid-refresh
+        self._task = asyncio.ensure_future(run())
+        self._task.add_done_callback(self._task_done)
+
+    def _task_done(self, task):
+        self._task = None
+        # A failed refresh leaves the key as it was, and the next request tries again: the error needs no handling
+        if not task.cancelled(): task.exception()
+
+
+@contextmanager
+def _nolock(): yield
+
+@asynccontextmanager
+async def _anolock(): yield
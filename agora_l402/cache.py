@@ -0,0 +1,229 @@
+"""TTL + LRU response cache for the read-only Agora endpoints"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/01_cache.ipynb.
+
+# %% auto 0
+__all__ = ['offload', 'MemoryBackend', 'SQLiteBackend', 'default_ttls', 'request_key', 'ResponseCache', 'SingleFlight']
+
+# %% ../nbs/01_cache.ipynb 3
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Dict
+from urllib.parse import urlencode
+import httpx
+from .deadline import DeadlineExceeded, bounded, check, no_deadline, within
+
+# %% ../nbs/01_cache.ipynb 5
+async def offload(backend, f, *args):
+    "`f(*args)`, run in a thread if `backend` may block, else right away"
+    return await asyncio.to_thread(f, *args) if getattr(backend, 'blocking', True) else f(*args)
+
+
+class MemoryBackend:
+    "Thread-safe in-memory LRU store with per-entry expiry"
+    blocking = False
+
+    def __init__(self,
+                 maxsize: int = 1024): # Maximum number of entries kept
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes:
+        "Value stored under `key`, or `None` if missing or expired"
+        with self._lock:
+            item = self._data.get(key)
+            if item is None: return None
+            value, expires = item
+            if expires < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        "Store `value` under `key` for `ttl` seconds, evicting the least recently used entries"
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize: self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock: self._data.clear()
+
+    def __len__(self): return len(self._data)
+
+# %% ../nbs/01_cache.ipynb 7
+class SQLiteBackend:
+    "LRU store with per-entry expiry in a SQLite file that several processes can share"
+    blocking = True # Waits on the file lock while another process writes
+
+    def __init__(self,
+                 path: str, # Database file, e.g. `~/.cache/agora/cache.db`
+                 maxsize: int = 10_000): # Maximum number of entries kept
+        self.path, self.maxsize = path, maxsize
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires REAL, used REAL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS cache_used ON cache(used)')
+
+    def get(self, key: str) -> bytes:
+        "Value stored under `key`, or `None` if missing or expired"
+        now = time.time()
+        with self._lock:
+            row = self._db.execute('SELECT value FROM cache WHERE key=? AND expires>?', (key, now)).fetchone()
+            if row is None: return None
+            self._db.execute('UPDATE cache SET used=? WHERE key=?', (now, key))
+        return row[0]
+
+    def set(self, key: str, value: bytes, ttl: float):
+        "Store `value` under `key` for `ttl` seconds, evicting the least recently used entries"
+        now = time.time()
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO cache VALUES (?,?,?,?)', (key, value, now + ttl, now))
+            self._db.execute('DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY used DESC LIMIT -1 OFFSET ?)',
+                             (self.maxsize,))
+
+    def clear(self):
+        with self._lock: self._db.execute('DELETE FROM cache')
+
+    def __len__(self): return self._db.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+# %% ../nbs/01_cache.ipynb 9
+default_ttls = {'search': 60, 'search/trial': 60, 'product-detail': 300}
+
+def request_key(path: str, params: dict = None) -> str:
+    "Normalized `path?params` identifying a read request"
+    norm = []
+    for k, v in sorted((params or {}).items()):
+        if v is None: continue
+        # Searches differing only in case or spacing return the same results
+        if k == 'q': v = ' '.join(str(v).split()).casefold()
+        norm.append((k, [str(o) for o in v] if isinstance(v, (list, tuple)) else str(v)))
+    return f'{path}?{urlencode(norm, doseq=True)}'
+
+def _encode(r: httpx.Response) -> bytes:
+    "Serialize status, headers and body of `r`"
+    head = json.dumps([r.status_code, r.headers.multi_items()]).encode()
+    return head + b'\n' + r.content
+
+def _decode(data: bytes, request: httpx.Request = None) -> httpx.Response:
+    "Rebuild a response serialized with `_encode`"
+    head, _, content = data.partition(b'\n')
+    status, headers = json.loads(head)
+    # The body is stored decoded, so the transfer headers no longer apply
+    headers = [(k, v) for k, v in headers if k.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')]
+    return httpx.Response(status, headers=headers, content=content, request=request)
+
+# %% ../nbs/01_cache.ipynb 10
+class ResponseCache:
+    "Caches successful responses of read-only Agora endpoints"
+    def __init__(self,
+                 ttls: Dict[str, float] = None, # Seconds to keep each endpoint path, merged over `default_ttls`
+                 maxsize: int = 1024, # Maximum entries for the default `MemoryBackend`
+                 backend = None): # Storage with `get`/`set`/`clear`, e.g. `SQLiteBackend`
+        self.ttls = {**default_ttls, **(ttls or {})}
+        self.backend = backend if backend is not None else MemoryBackend(maxsize)
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, method: str, path: str, params: dict = None) -> str:
+        "Cache key for a request, or `None` if the request must not be cached"
+        if method.upper() != 'GET' or path not in self.ttls: return None
+        return request_key(path, params)
+
+    def get(self, key: str, request: httpx.Request = None) -> httpx.Response:
+        "Cached response for `key`, or `None` on a miss"
+        data = self.backend.get(key)
+        with self._lock:
+            if data is None: self.misses += 1
+            else: self.hits += 1
+        return None if data is None else _decode(data, request)
+
+    def set(self, key: str, r: httpx.Response):
+        "Store `r` under `key` if it succeeded"
+        if not r.is_success: return
+        path = key.partition('?')[0]
+        self.backend.set(key, _encode(r), self.ttls[path])
+
+    async def aget(self, key: str, request: httpx.Request = None) -> httpx.Response:
+        "Cached response for `key`, or `None` on a miss, without blocking the event loop"
+        return await offload(self.backend, self.get, key, request)
+
+    async def aset(self, key: str, r: httpx.Response):
+        "Store `r` under `key` if it succeeded, without blocking the event loop"
+        if r.is_success: await offload(self.backend, self.set, key, r)
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock: self.hits = self.misses = 0
+
+    @property
+    def stats(self) -> dict:
+        "Hit/miss counters and current size"
+        return dict(hits=self.hits, misses=self.misses, size=len(self.backend))
+
+# %% ../nbs/01_cache.ipynb 18
+class SingleFlight:
+    "Lets concurrent identical calls share one execution and its result"
+    def __init__(self):
+        self._calls, self._tasks, self._waiting = {}, {}, {}
+        self._lock = threading.Lock()
+
+    def do(self,
+           key: str, # Identity of the call
+           f, # The call, run by the first caller
+           name: str = None): # Name of the call, for `DeadlineExceeded`
+        "Call `f()`, unless a call for `key` is already running, in which case wait for its result"
+        while True:
+            with self._lock:
+                fut = self._calls.get(key)
+                leader = fut is None
+                if leader: fut = self._calls[key] = Future()
+            if leader: break
+            try: return fut.result(bounded(None))
+            except DeadlineExceeded:
+                # The call ran out of its caller's time, not necessarily of ours
+                check(name)
+            except FutureTimeout: raise DeadlineExceeded(name) from None
+        # The call is forgotten before its result is set, so a caller retrying after an error starts a new one
+        try: res = f()
+        except BaseException as e:
+            with self._lock: del self._calls[key]
+            fut.set_exception(e)
+            raise
+        with self._lock: del self._calls[key]
+        fut.set_result(res)
+        return res
+
+    def _done(self, key):
+        def done(task):
+            if self._tasks.get(key) is task: del self._tasks[key]
+            # Its callers may all have given up (e.g. at their deadline): the error is theirs, don't log it as unhandled
+            if not task.cancelled(): task.exception()
+        return done
+
+    async def ado(self, key: str, f, name: str = None):
+        "Await `f()`, unless a call for `key` is already running, in which case await its result. See `SingleFlight.do`"
+        task = self._tasks.get(key)
+        if task is None:
+            # Shared by callers with deadlines of their own, so it runs without any
+            with no_deadline(): task = self._tasks[key] = asyncio.ensure_future(f())
+            task.add_done_callback(self._done(key))
+        self._waiting[task] = self._waiting.get(task, 0) + 1
+        # Shielded so a caller that gets cancelled, or runs out of time, doesn't cancel the call the others are waiting for
+        try: return await within(asyncio.shield(task), name)
+        finally:
+            self._waiting[task] -= 1
+            if not self._waiting[task]:
+                del self._waiting[task]
+                # Nobody waits for the answer any more: stop the call, which frees its connection. A caller
+                # coming after that starts a new one rather than joining the call being cancelled.
+                if self._tasks.get(key) is task: del self._tasks[key]
+                if not task.done(): task.cancel()
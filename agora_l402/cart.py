@@ -0,0 +1,144 @@
+"""Local cart mirror and batching of cart updates per user"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/09_cart.ipynb.
+
+# %% auto 0
+__all__ = ['LocalCart', 'Carts']
+
+# %% ../nbs/09_cart.ipynb 3
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, List
+
+# %% ../nbs/09_cart.ipynb 5
+_upstream_keys = ('product', 'variantId', 'quantity')
+
+def _key(item: dict) -> tuple: return str(item['product']), str(item['variantId'])
+
+def _merge(items: List[dict]) -> List[dict]:
+    "One line per variant in `items`, with their quantities summed"
+    lines = {}
+    for o in items:
+        line = lines.setdefault(_key(o), {'product': o['product'], 'variantId': o['variantId'], 'quantity': 0})
+        line['quantity'] += o.get('quantity', 1)
+    return list(lines.values())
+
+class LocalCart:
+    "Contents of a user's cart, as built through the client"
+    def __init__(self):
+        self._lines, self._info = {}, {}
+
+    def merged(self, items: List[dict]) -> List[dict]:
+        "Lines of the cart with `items` added, quantities of the same variant summed. The cart is not changed"
+        return [o for o in _merge(list(self._lines.values()) + items) if o['quantity'] > 0]
+
+    def replace(self,
+                lines: List[dict], # New contents of the cart
+                items: List[dict] = None): # Items whose local fields (`price`, `name`, ...) to remember, defaults to `lines`
+        "Set the contents of the cart to `lines`"
+        self._lines = {}
+        self._lines = {_key(o): o for o in self.merged(lines)}
+        for o in (lines if items is None else items):
+            extra = {k: v for k, v in o.items() if k not in _upstream_keys}
+            if extra: self._info.setdefault(_key(o), {}).update(extra)
+
+    def add(self, items: List[dict]):
+        "Add `items` to the cart"
+        self.replace(self.merged(items), items)
+
+    @property
+    def items(self) -> List[dict]: return [{**o, **self._info.get(k, {})} for k, o in self._lines.items()]
+
+    @property
+    def count(self) -> int:
+        "Number of units in the cart"
+        return sum(o['quantity'] for o in self._lines.values())
+
+    @property
+    def total(self) -> float:
+        "Sum of `price * quantity` over the lines with a known price"
+        return sum(self._info.get(k, {}).get('price', 0) * o['quantity'] for k, o in self._lines.items())
+
+    def to_dict(self) -> dict: return dict(items=self.items, count=self.count, total=self.total)
+    def __repr__(self): return f'LocalCart(count={self.count}, total={self.total})'
+
+# %% ../nbs/09_cart.ipynb 7
+class Carts:
+    "Local carts per user, and batching of the adds waiting to be sent"
+    def __init__(self):
+        self._carts, self._pending, self._locks, self._alocks = {}, {}, {}, {}
+        self._lock = threading.Lock()
+
+    def get(self, user: str) -> LocalCart:
+        "Local cart of `user` (`None` for the account's own cart)"
+        with self._lock: return self._carts.setdefault(user, LocalCart())
+
+    def update(self, user: str, items: List[dict], replace: bool = False):
+        "Apply a successful cart call made without `add` to the local cart of `user`"
+        with self._lock:
+            cart = self._carts.setdefault(user, LocalCart())
+            if replace: cart.replace(items)
+            else: cart.add(items)
+
+    def _enqueue(self, user, items, fut, locks, lock_cls):
+        with self._lock:
+            self._pending.setdefault(user, []).append((items, fut))
+            return locks.setdefault(user, lock_cls())
+
+    def _take(self, user):
+        "The adds waiting for `user`, their items, and the lines to send for them"
+        with self._lock: batch = self._pending.pop(user, [])
+        items = [o for added, _ in batch for o in added]
+        return batch, items, [o for o in _merge(items) if o['quantity']]
+
+    def _sent(self, user, items, line, r) -> bool:
+        "Apply `line` to the local cart of `user` if it was added upstream"
+        if not r.is_success: return False
+        with self._lock: self._carts.setdefault(user, LocalCart()).add([o for o in items if _key(o) == _key(line)])
+        return True
+
+    def _done(self, batch, r=None, e=None):
+        for _, f in batch:
+            if f.done(): continue # a waiter that was cancelled
+            if e is None: f.set_result(r)
+            elif isinstance(e, asyncio.CancelledError): f.cancel()
+            else: f.set_exception(e)
+
+    def add(self,
+            user: str, # Cart owner, the `custom_user_id`
+            items: List[dict], # Items with `product`, `variantId`, `quantity` and any local fields such as `price`
+            send: Callable): # `send(user, line)` adds one line (`product`, `variantId`, `quantity`) to the upstream cart
+        "Add `items` to the cart of `user`, together with any other adds waiting for that user"
+        fut = Future()
+        # One round per user at a time: whoever holds the lock sends everything queued so far
+        with self._enqueue(user, items, fut, self._locks, threading.Lock):
+            batch, items, lines = self._take(user)
+            if batch:
+                r = None
+                try:
+                    for line in lines:
+                        r = send(user, line)
+                        if not self._sent(user, items, line, r): break # the failed response goes to every waiter
+                    self._done(batch, r=r)
+                except BaseException as e:
+                    self._done(batch, e=e) # nobody is left waiting, whatever stopped the round
+                    if not isinstance(e, Exception): raise
+        return fut.result()
+
+    async def aadd(self, user: str, items: List[dict], send: Callable):
+        "Add `items` to the cart of `user`, awaiting `send`. See `Carts.add`"
+        fut = asyncio.get_running_loop().create_future()
+        async with self._enqueue(user, items, fut, self._alocks, asyncio.Lock):
+            batch, items, lines = self._take(user)
+            if batch:
+                r = None
+                try:
+                    for line in lines:
+                        r = await send(user, line)
+                        if not self._sent(user, items, line, r): break
+                    self._done(batch, r=r)
+                except BaseException as e:
+                    self._done(batch, e=e) # a cancelled round cancels the adds it carried
+                    if not isinstance(e, Exception): raise
+        return await fut
@@ -0,0 +1,155 @@
+"""Record API responses to a file and replay them without the network"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/16_cassette.ipynb.
+
+# %% auto 0
+__all__ = ['CassetteMiss', 'Cassette', 'CassetteTransport', 'use_cassette']
+
+# %% ../nbs/16_cassette.ipynb 3
+import hashlib
+import json
+import mmap
+import struct
+import threading
+from pathlib import Path
+from typing import Tuple
+import httpx
+from .cache import request_key, _encode, _decode
+
+try: import fcntl
+except ImportError: fcntl = None # No cross-process locking on Windows
+
+# %% ../nbs/16_cassette.ipynb 5
+class CassetteMiss(LookupError):
+    "A request has no recorded response and the cassette is in replay mode"
+
+_head = struct.Struct('<II') # Lengths of the key and of the response that follow
+
+class Cassette:
+    "Responses recorded to a file, indexed by request and read from a memory mapping"
+    def __init__(self,
+                 path: str, # Cassette file, created when recording
+                 mode: str = 'auto', # `replay`, `record`, or `auto` to replay what was recorded and record the rest
+                 match: Tuple[str, ...] = ('method', 'path', 'params'), # Parts of a request that must match, out of those and `host`, `body`
+                 ignore: Tuple[str, ...] = ()): # Query parameters left out of the match
+        if mode not in ('replay', 'record', 'auto'): raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path, self.mode, self.match, self.ignore = Path(path), mode, match, set(ignore)
+        self._index, self._played = {}, {}
+        self._mm, self._file = None, None
+        self._lock = threading.Lock()
+        if self.path.exists(): self._scan()
+
+    def _scan(self):
+        "Index the records of the file"
+        with open(self.path, 'rb') as f:
+            off = 0
+            while head := f.read(_head.size):
+                if len(head) < _head.size: break # a record cut short by a crash
+                klen, rlen = _head.unpack(head)
+                key = f.read(klen).decode()
+                self._index.setdefault(key, []).append((off + _head.size + klen, rlen))
+                off += _head.size + klen + rlen
+                f.seek(off)
+
+    def key(self, request: httpx.Request) -> str:
+        "Identity of `request` for matching"
+        url, parts = request.url, []
+        if 'method' in self.match: parts.append(request.method)
+        if 'host' in self.match: parts.append(url.host)
+        params = {k: url.params.get_list(k) for k in url.params if k not in self.ignore} if 'params' in self.match else None
+        parts.append(request_key(url.path if 'path' in self.match else '', params))
+        if 'body' in self.match: parts.append(_body_digest(request))
+        return ' '.join(parts)
+
+    def _read(self, off: int, n: int) -> bytes:
+        if self._mm is None or off + n > len(self._mm):
+            # Responses recorded since the file was mapped are past its end: map it again
+            if self._mm is not None: self._mm.close()
+            with open(self.path, 'rb') as f: self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm[off:off + n]
+
+    def get(self, request: httpx.Request) -> httpx.Response:
+        "Next recorded response for `request`, or `None`"
+        key = self.key(request)
+        with self._lock:
+            recs = self._index.get(key)
+            if not recs: return None
+            i = self._played.get(key, 0)
+            self._played[key] = i + 1
+            return _decode(self._read(*recs[min(i, len(recs) - 1)]), request)
+
+    def put(self, request: httpx.Request, response: httpx.Response):
+        "Append the response to `request`, which must have been read"
+        key, data = self.key(request).encode(), _encode(response)
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'ab')
+            f = self._file
+            # Other processes may append to the file too: the end of the file, under the lock, is where this record goes
+            if fcntl is not None: fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                off = f.seek(0, 2)
+                f.write(_head.pack(len(key), len(data)) + key + data)
+                f.flush()
+            finally:
+                if fcntl is not None: fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            self._index.setdefault(key.decode(), []).append((off + _head.size + len(key), len(data)))
+
+    def close(self):
+        "Close the file and its mapping, they are opened again when needed"
+        with self._lock:
+            if self._file is not None: self._file.close(); self._file = None
+            if self._mm is not None: self._mm.close(); self._mm = None
+
+    def __len__(self): return sum(map(len, self._index.values()))
+
+
+def _body_digest(request: httpx.Request) -> str:
+    "Digest of the body of `request`, JSON bodies normalized"
+    body = request.read()
+    if request.headers.get('content-type', '').startswith('application/json'):
+        try: body = json.dumps(json.loads(body), sort_keys=True, separators=(',', ':')).encode()
+        except ValueError: pass
+    return hashlib.sha256(body).hexdigest()[:16]
+
+# %% ../nbs/16_cassette.ipynb 6
+class CassetteTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    "Transport answering from a `Cassette`, and recording what `transport` answers into it"
+    def __init__(self, cassette: Cassette, transport = None):
+        self.cassette, self.transport = cassette, transport
+
+    def _replay(self, request):
+        if self.cassette.mode == 'record': return None
+        r = self.cassette.get(request)
+        if r is None and self.cassette.mode == 'replay': raise CassetteMiss(f"No recorded response for {self.cassette.key(request)}")
+        return r
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        r = self._replay(request)
+        if r is not None: return r
+        r = self.transport.handle_request(request)
+        r.read()
+        self.cassette.put(request, r)
+        return r
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        r = self._replay(request)
+        if r is not None: return r
+        r = await self.transport.handle_async_request(request)
+        await r.aread()
+        self.cassette.put(request, r)
+        return r
+
+    def close(self):
+        if self.transport is not None: self.transport.close()
+    async def aclose(self):
+        if self.transport is not None: await self.transport.aclose()
+
+
+def use_cassette(client, # `httpx.Client` or `httpx.AsyncClient`
+                 cassette: Cassette):
+    "Route all the requests of `client`, including those to mounted hosts, through `cassette`"
+    client._transport = CassetteTransport(cassette, client._transport)
+    client._mounts = {k: CassetteTransport(cassette, t) if t is not None else t for k, t in client._mounts.items()}
+    return client
@@ -3,36 +3,340 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/00_core.ipynb.
 
 # %% auto 0
-__all__ = ['base_url', 'Agora']
+__all__ = ['base_url', 'Agora', 'AsyncAgora']
 
 # %% ../nbs/00_core.ipynb 3
-from fastcore.utils import *
 import os
 import httpx
 from typing import Dict, Any, List
 import json
-from fewsats.core import Fewsats
+import re
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from .utils import patch
+from .cache import ResponseCache, SingleFlight, request_key
+from .models import *
+from .retry import *
+from .ratelimit import RateLimiter
+from .metrics import Instrumentation
+from .cart import Carts
+from .payments import PaymentIntents
+from .auth import CredentialManager
+from .index import ProductIndex
+from .tracking import OrderWatcher
+from .images import ImageIds
+from .fanout import merge_products
+from .cassette import Cassette, use_cassette
+from .scheduler import Scheduler
+from .deadline import DeadlineExceeded, bounded, check, clip_timeout, fits, remaining, within, in_context
 
 # %% ../nbs/00_core.ipynb 4
 base_url = 'https://zues.searchagora.com/api/v1'
 
 # %% ../nbs/00_core.ipynb 5
-class Agora:
-    "Client for interacting with the Agora API"
+def _search_params(query, price_min=0, price_max=None, sort=None, order=None, **extra):
+    "Build the query parameters shared by the search endpoints"
+    params = {'q': query, **extra}
+
+    # Handle price range parameters
+    if price_min != 0 and price_max is not None:
+        params['priceRange'] = [price_min, price_max]
+
+    if sort: params['sort'] = sort
+    if order: params['order'] = order
+    return params
+
+# %% ../nbs/00_core.ipynb 6
+def _pool_kwargs(transport_cls, # `httpx.HTTPTransport` or `httpx.AsyncHTTPTransport`
+                 max_connections: int = 100,
+                 max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.,
+                 http2: bool = False,
+                 host_limits: Dict[str, int] = None):
+    "httpx client arguments for a keep-alive connection pool, with optional per-host connection caps"
+    limits = httpx.Limits(max_connections=max_connections,
+                          max_keepalive_connections=max_keepalive_connections,
+                          keepalive_expiry=keepalive_expiry)
+    # Each capped host gets its own transport (and therefore its own pool)
+    mounts = {host: transport_cls(http2=http2, limits=httpx.Limits(max_connections=n,
+                                                                  max_keepalive_connections=min(n, max_keepalive_connections),
+                                                                  keepalive_expiry=keepalive_expiry))
+              for host, n in (host_limits or {}).items()}
+    return dict(limits=limits, http2=http2, mounts=mounts)
+
+# %% ../nbs/00_core.ipynb 7
+class _AgoraBase:
+    "Configuration shared by the sync and async Agora clients"
+    _client_cls, _transport_cls = None, None
     def __init__(self,
                  api_key: str = None, # The API key for the Agora account
-                 base_url: str = "https://zues.searchagora.com/api/v1"): # The Agora API base URL
+                 base_url: str = "https://zues.searchagora.com/api/v1", # The Agora API base URL
+                 max_connections: int = 100, # Maximum number of open connections in the pool
+                 max_keepalive_connections: int = 20, # Idle connections kept warm for reuse
+                 keepalive_expiry: float = 30., # Seconds an idle connection stays in the pool
+                 http2: bool = False, # Negotiate HTTP/2 (requires `pip install httpx[http2]`)
+                 host_limits: Dict[str, int] = None, # Max connections per host, e.g. `{"https://zues.searchagora.com": 10}`
+                 cache: ResponseCache = None, # Cache for search and product detail responses, `True` for the defaults
+                 retry: RetryPolicy = None, # Retry policy for transient failures, defaults to `RetryPolicy()`
+                 breakers: Breakers = None, # Per-endpoint circuit breakers, defaults to `Breakers()`
+                 rate_limiter: RateLimiter = None, # Per-endpoint token buckets applied before every attempt
+                 coalesce: bool = True, # Share one upstream call between concurrent identical `GET` requests
+                 instrumentation: Instrumentation = None, # Receives a span for every upstream call, defaults to `Instrumentation()`
+                 fewsats = None, # `Fewsats` client for payment intents, by default created from `FEWSATS_API_KEY` on first use
+                 payments: PaymentIntents = None, # Recently created payment intents, defaults to `PaymentIntents()`
+                 credentials: CredentialManager = None, # Refreshes the API key before it expires and after a 401
+                 index: ProductIndex = None, # Products of the responses seen, for `local_search`, `True` for the defaults
+                 images: ImageIds = None, # `image_id`s of the images uploaded, defaults to `ImageIds()`
+                 image_upload_path: str = "image-upload", # Path of the image upload endpoint, relative to `base_url`
+                 cassette: Cassette = None, # Records the responses to a file, or replays them from it instead of calling the APIs
+                 scheduler: Scheduler = None, # Separate concurrency limits for checkout and browsing, shedding browsing first, `True` for the defaults
+                 timeout: float = 10.): # Seconds each attempt may take to connect, read, write or wait for a connection, less within a `deadline`
         self.api_key = api_key or os.environ.get("AGORA_API_KEY")
         # TODO: maybe change this for a decorator so search_trial can be used without api_key
         # if not self.api_key:
         #     raise ValueError("The api_key client option must be set either by passing api_key to the client or by setting the AGORA_API_KEY environment variable")
-        self.base_url = base_url
-        self._httpx_client = httpx.Client()
+        self.base_url, self.timeout = base_url, timeout
+        self._pool = dict(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections,
+                          keepalive_expiry=keepalive_expiry, http2=http2, host_limits=host_limits)
+        self._httpx_client = self._client_cls(**_pool_kwargs(self._transport_cls, **self._pool))
         self._httpx_client.headers.update({"Authorization": f"Bearer {self.api_key}"})
+        self.cassette = cassette
+        if cassette is not None:
+            use_cassette(self._httpx_client, cassette)
+            if fewsats is not None: use_cassette(fewsats._httpx_client, cassette)
+        self._fewsats = fewsats
+        self.cache = ResponseCache() if cache is True else (cache or None)
+        self.retry = retry or RetryPolicy()
+        self.breakers = breakers or Breakers()
+        self.rate_limiter = rate_limiter
+        self.scheduler = Scheduler() if scheduler is True else (scheduler or None)
+        self._flights = SingleFlight() if coalesce else None
+        self.instrumentation = instrumentation or Instrumentation()
+        self.carts = Carts()
+        self.payments = payments or PaymentIntents()
+        self.index = ProductIndex() if index is True else (index or None)
+        self._orders = None
+        self.images, self.image_upload_path = images or ImageIds(), image_upload_path
+        self.credentials = credentials
+        if credentials is not None:
+            # A key stored by a sibling process is newer than the one we were given
+            if credentials.api_key: self._use_key(credentials.credentials)
+            else: credentials.credentials.api_key = self.api_key
+            credentials.on_change = self._use_key
+
 
+class Agora(_AgoraBase):
+    "Client for interacting with the Agora API"
+    _client_cls, _transport_cls = httpx.Client, httpx.HTTPTransport
+
+    def close(self):
+        "Close the underlying connection pool"
+        self._httpx_client.close()
+        if self._fewsats is not None: self._fewsats._httpx_client.close()
+        if self.cassette is not None: self.cassette.close()
+
+    def __enter__(self): return self
+    def __exit__(self, *args): self.close()
+
+# %% ../nbs/00_core.ipynb 10
+@patch(as_prop=True)
+def fewsats(self: _AgoraBase):
+    "Long-lived Fewsats client whose connections are pooled like the Agora ones"
+    if self._fewsats is None:
+        from fewsats.core import Fewsats # Imported on first use, it is slow to load and only payments need it
+        fs = Fewsats()
+        # Fewsats is synchronous, so it always gets a sync pool (the async client runs it in an executor)
+        client = httpx.Client(headers=fs._httpx_client.headers, **_pool_kwargs(httpx.HTTPTransport, **self._pool))
+        fs._httpx_client.close()
+        if self.cassette is not None: use_cassette(client, self.cassette)
+        fs._httpx_client, self._fewsats = client, fs
+    return self._fewsats
+
+
+@patch
+def _create_offers(self: _AgoraBase, offers: List[dict]) -> httpx.Response:
+    "Create Fewsats offers, instrumented like the Agora requests"
+    span = self.instrumentation.start('fewsats.create_offers', endpoint='fewsats/offers', method='POST', attempt=1)
+    try: r = self.fewsats.create_offers(offers)
+    except Exception as e:
+        self.instrumentation.end(span, error=e)
+        raise
+    self.instrumentation.end(span, response=r)
+    return r
+
+
+# %% ../nbs/00_core.ipynb 11
+@patch
+def _build_request(self: _AgoraBase,
+                   method: str, # The HTTP method to use
+                   path: str, # The path to request
+                   timeout: float = None, # Timeout for the request in s, defaults to the client's `timeout`
+                   auth: bool = True, # Send the Authorization header
+                   **kwargs) -> httpx.Request:
+    "Build a request against the Agora API on the shared client"
+    url = f"{self.base_url}/{path}"
+    req = self._httpx_client.build_request(method, url, timeout=timeout if timeout is not None else self.timeout, **kwargs)
+    if not auth: del req.headers['Authorization']
+    return req
+
+
+def _endpoint(path: str) -> str:
+    "Endpoint name of a request path, without ids (`order-tracking/67c8...` -> `order-tracking`)"
+    return '/'.join(p for p in path.split('/') if not re.fullmatch(r'[0-9a-fA-F]{24}|\d+', p))
+
+
+@patch
+def _cache_key(self: _AgoraBase, method, path, params=None):
+    "Response cache key for a request, `None` if caching is off or the request is not cacheable"
+    return self.cache.key(method, path, params) if self.cache is not None else None
+
+
+_trial_count = 20 # Products in a page of the trial search, which takes no `count`
+
+@patch
+def _indexed(self: _AgoraBase, r: Result, params: dict = None) -> Result:
+    "`r`, once its products are in the product index, as results of the search `params` if given"
+    if self.index is None or not r.is_success: return r
+    if isinstance(r, ProductDetail):
+        if r.product is not None: self.index.add([r.product])
+    elif not params.get('imageId'):
+        # Only a page shorter than the count asked for is known to be the last one
+        last = len(r.products) < int(params.get('count', _trial_count))
+        self.index.add(r.products, params['q'], params.get('priceRange'), int(params.get('page', 1)), last)
+    return r
+
+
+@patch
+def _use_key(self: _AgoraBase, c: Credentials):
+    "Authenticate the following requests with `c.api_key`"
+    self.api_key = c.api_key
+    self._httpx_client.headers['Authorization'] = f"Bearer {c.api_key}"
+
+
+@patch
+def _store_credentials(self: _AgoraBase, c: Credentials):
+    "Switch to the credentials returned by `refresh_token`, through the credential manager if there is one"
+    if self.credentials is not None: self.credentials.set(c)
+    else: self._use_key(c)
+
+
+def _stale_key(req: httpx.Request) -> str: return req.headers.get('Authorization', '')[len('Bearer '):]
+
+
+@patch
+def _refreshable(self: _AgoraBase, r: httpx.Response, auth: bool) -> bool:
+    "Whether `r` was rejected for an expired key that the credential manager can replace"
+    return r.status_code == 401 and auth and self.credentials is not None and self.credentials.can_refresh
 
 
-# %% ../nbs/00_core.ipynb 7
+@patch
+def _request(self: Agora, 
+             method: str, # The HTTP method to use
+             path: str, # The path to request
+             timeout: float = None, # Timeout for the request in s, defaults to the client's `timeout`
+             auth: bool = True, # Send the Authorization header
+             **kwargs) -> Dict[str, Any]:
+    "Makes an authenticated request to Agora API"
+    if auth: self._check_credentials()
+    req = self._build_request(method, path, timeout=timeout, auth=auth, **kwargs)
+    key = self._cache_key(method, path, kwargs.get('params'))
+    if key is not None:
+        r = self.cache.get(key, req)
+        self.instrumentation.cache(_endpoint(path), r is not None)
+        if r is not None: return r
+    def send():
+        r = self._send(req, _endpoint(path))
+        if self._refreshable(r, auth):
+            # Concurrent requests rejected with the same key share one refresh, then each is sent once more
+            self.credentials.refresh(_stale_key(req), self._new_credentials)
+            req.headers['Authorization'] = self._httpx_client.headers['Authorization']
+            r = self._send(req, _endpoint(path))
+        if key is not None: self.cache.set(key, r)
+        return r
+    if self._flights is None or method != 'GET': return send()
+    return self._flights.do(request_key(path, kwargs.get('params')), send, _endpoint(path))
+
+
+@patch
+def _check_credentials(self: Agora):
+    "Refresh the API key when it is about to expire: in the background, or right away once it has"
+    c = self.credentials
+    if c is None or not c.due(): return
+    if c.expires_in() > 0: c.refresh_in_background(c.api_key, self._new_credentials)
+    else: c.refresh(c.api_key, self._new_credentials)
+
+
+@patch
+def _new_credentials(self: Agora, refresh_token: str) -> Credentials: return self.refresh_token(refresh_token).credentials
+
+
+@patch
+def _span(self: _AgoraBase, req: httpx.Request, endpoint: str, attempt: int):
+    "Start the instrumentation span of one attempt at `req`"
+    return self.instrumentation.start('agora.request', endpoint=endpoint, method=req.method, attempt=attempt,
+                                      bytes_out=int(req.headers.get('content-length', 0)))
+
+
+def _cut_short(e: Exception, req: httpx.Request, timeout: dict) -> bool:
+    "Whether `e` is a timeout of `req` that fired at the deadline, before the `timeout` it was configured with"
+    left = remaining()
+    return (isinstance(e, httpx.TimeoutException) and req.extensions.get('timeout') != timeout
+            and left is not None and left <= 0)
+
+
+@patch
+def _send(self: Agora, req: httpx.Request, endpoint: str) -> httpx.Response:
+    "Send `req`, retrying transient failures and keeping the endpoint's circuit breaker up to date"
+    breaker, attempt, timeout = self.breakers[endpoint], 0, req.extensions.get('timeout')
+    while True:
+        if not breaker.allow(): raise CircuitOpenError(endpoint, breaker.retry_in())
+        attempt += 1
+        try: r = self._attempt(req, endpoint, attempt, timeout)
+        except httpx.TransportError as e:
+            # The caller's deadline ended the attempt, not a failure of the endpoint
+            if _cut_short(e, req, timeout): breaker.release(); raise DeadlineExceeded(endpoint) from e
+            breaker.record(False)
+            check(endpoint)
+            delay = self.retry.delay(attempt)
+            if not self.retry.retryable(req, attempt, error=e) or not fits(delay): raise
+            time.sleep(delay)
+            continue
+        except BaseException:
+            # Shed, out of time or cancelled: no outcome, so a probe hands over to the next request
+            breaker.release()
+            raise
+        breaker.record(r.status_code < 500)
+        if not self.retry.retryable(req, attempt, response=r): return r
+        # A retry that can't be answered before the deadline isn't worth starting
+        delay = self.retry.delay(attempt, r)
+        if not fits(delay): return r
+        r.close()
+        time.sleep(delay)
+
+
+@patch
+def _attempt(self: Agora, req: httpx.Request, endpoint: str, attempt: int, timeout: dict) -> httpx.Response:
+    "One attempt at `req`: wait for the rate limiter and a scheduler slot, then send it within the time left"
+    # Waiting for a turn that comes after the deadline is pointless
+    if self.rate_limiter is not None and not self.rate_limiter.acquire(endpoint, timeout=bounded(None)):
+        raise DeadlineExceeded(endpoint)
+    # Within a deadline, each attempt at a read only gets the time left. A write that was sent can't be taken back:
+    # cut short, its outcome would be unknown, so it keeps its full timeout, as long as it starts in time.
+    if req.method == 'GET': req.extensions['timeout'] = clip_timeout(timeout, endpoint)
+    else: check(endpoint)
+    # The slot is held for the attempt only, not while waiting to retry
+    with self.scheduler.slot(endpoint) if self.scheduler is not None else nullcontext():
+        span = self._span(req, endpoint, attempt)
+        try: r = self._httpx_client.send(req)
+        except BaseException as e:
+            self.instrumentation.end(span, error=e)
+            raise
+    self.instrumentation.end(span, response=r)
+    return r
+
+# %% ../nbs/00_core.ipynb 13
 @patch
 def search_trial(self: Agora,
                  query: str, # Search query text
@@ -56,33 +360,13 @@ def search_trial(self: Agora,
     Example:
         search_trial("shoes", [100, 1000], "price:relevance", "desc")
     """
-    endpoint = f'{self.base_url}/search/trial'
-    
     # Build query parameters
-    params = {'q': query}
-
-    # Handle price range parameters
-    if price_min != 0 and price_max is not None:
-        params['priceRange'] = [price_min, price_max]
-        
-    if sort: params['sort'] = sort
-    if order: params['order'] = order
+    params = _search_params(query, price_min, price_max, sort, order)
     
-    # Make the request
-    return httpx.get(endpoint, params=params)
-
-# %% ../nbs/00_core.ipynb 11
-@patch
-def _request(self: Agora, 
-             method: str, # The HTTP method to use
-             path: str, # The path to request
-             timeout: int = 10, # Timeout for the request in s
-             **kwargs) -> Dict[str, Any]:
-    "Makes an authenticated request to Agora API"
-    url = f"{self.base_url}/{path}"
-    return  self._httpx_client.request(method, url, timeout=timeout, **kwargs)
-
+    # Make the request (the trial endpoint doesn't need auth)
+    return self._indexed(SearchResults(self._request('GET', path='search/trial', auth=False, params=params)), params)
 
+# %% ../nbs/00_core.ipynb 17
 @patch
 def text_search(self: Agora, 
                 query: str, # Search query text
@@ -114,20 +398,71 @@ def text_search(self: Agora,
     """
     
     # Build query parameters
-    params = {'q': query, 'count': count, 'page': page}
-    
-    # Handle price range parameters
-    if price_min != 0 and price_max is not None:
-        params['priceRange'] = [price_min, price_max]
-        
-    if sort: params['sort'] = sort
-    if order: params['order'] = order
+    params = _search_params(query, price_min, price_max, sort, order, count=count, page=page)
     if image_id: params['imageId'] = image_id
     
-    return self._request('GET', path='search', params=params)
+    return self._indexed(SearchResults(self._request('GET', path='search', params=params)), params)
     
 
-# %% ../nbs/00_core.ipynb 12
+# %% ../nbs/00_core.ipynb 18
+def _page_products(r: SearchResults) -> List[Product]:
+    "Products of a search results page"
+    return r.raise_for_status().products
+
+
+@patch
+def iter_search(self: Agora,
+                query: str, # Search query text
+                count: int = 100, # Number of products fetched per page (max: 250)
+                price_min: int = 0, # Minimum price for filtering products
+                price_max: int = None, # Maximum price for filtering products
+                sort: str = None, # Sorting field: price:relevance
+                order: str = None, # Sorting order: asc or desc
+                image_id: str = None, # Image search identifier
+                max_items: int = None): # Stop after this many products
+    """
+    Iterate over all the products matching a search, page by page.
+    
+    The next page is fetched in the background while the current one is consumed, and
+    at most two pages are held in memory.
+    
+    Args:
+        query (str): Search query text
+        count (int, optional): Number of products fetched per page (default: 100, max: 250)
+        price_min (int, optional): Minimum price for filtering products (default: 0)
+        price_max (int, optional): Maximum price for filtering products
+        sort (str, optional): Sorting field: price:relevance
+        order (str, optional): Sorting order: asc or desc
+        image_id (str, optional): Image search identifier
+        max_items (int, optional): Stop after this many products
+        
+    Yields:
+        Product: Products matching the query
+    
+    Example:
+        for p in agora.iter_search("red shoes", price_min=50, price_max=200, max_items=1000): ...
+    """
+    def fetch(page):
+        return _page_products(self.text_search(query, count=count, page=page, price_min=price_min, price_max=price_max,
+                                               sort=sort, order=order, image_id=image_id))
+    ex, fetch = ThreadPoolExecutor(max_workers=1), in_context(fetch)
+    try:
+        page, n = 1, 0
+        fut = ex.submit(fetch, page)
+        while True:
+            products = fut.result()
+            last = len(products) < count
+            if not last and (max_items is None or n + len(products) < max_items):
+                page += 1
+                fut = ex.submit(fetch, page)
+            for p in products:
+                if max_items is not None and n >= max_items: return
+                yield p
+                n += 1
+            if last or (max_items is not None and n >= max_items): return
+    finally: ex.shutdown(wait=False)
+
+# %% ../nbs/00_core.ipynb 20
 @patch
 def get_product_detail(self: Agora, 
                       slug: str): # The unique identifier of the product to retrieve
@@ -147,10 +482,210 @@ def get_product_detail(self: Agora,
     params = {'slug': slug}
     
     # Make the request
-    return self._request('GET', path='product-detail', params=params)
+    return self._indexed(ProductDetail(self._request('GET', path='product-detail', params=params)))
+
+# %% ../nbs/00_core.ipynb 21
+@patch
+def get_product_details(self: Agora,
+                        slugs: List[str], # Unique identifiers of the products to retrieve
+                        concurrency: int = 8): # Maximum number of requests in flight
+    """
+    Retrieve detailed information about several products concurrently.
+    
+    Args:
+        slugs (list): Unique identifiers of the products to retrieve. Repeated slugs are fetched once.
+        concurrency (int, optional): Maximum number of requests in flight (default: 8)
+        
+    Returns:
+        dict: Product detail response for each slug, in input order. A slug whose request
+              failed maps to the exception that was raised instead.
+    
+    Example:
+        agora.get_product_details(["calzuro-without-pistachio-eb12f468-48a2-48af-9f5e-3fda5f6c135c-1708446961787"])
+    """
+    if concurrency < 1: raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    unique = list(dict.fromkeys(slugs))
+    if not unique: return {}
+    def fetch(slug):
+        try: return self.get_product_detail(slug)
+        except Exception as e: return e
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(unique))) as ex:
+        # The fetches run within the caller's deadline
+        return dict(zip(unique, ex.map(in_context(fetch), unique)))
+
+# %% ../nbs/00_core.ipynb 23
+def _results_page(products: List[Product]) -> SearchResults:
+    "Search results page made of `products`, for answers built locally"
+    return SearchResults(httpx.Response(200, json={'Products': [p.to_dict() for p in products]}))
+
+
+@patch
+def local_search(self: Agora,
+                 query: str, # Query of an earlier search
+                 price_min: int = 0, # Minimum price for filtering products
+                 price_max: int = None, # Maximum price for filtering products
+                 keywords: str = None, # Words the product name, brand or store must contain
+                 sort: str = None, # Sorting field: price:relevance
+                 order: str = None, # Sorting order: asc or desc
+                 count: int = 20, # Maximum number of products returned
+                 min_results: int = 1): # Search upstream when fewer products match locally
+    """
+    Refine an earlier search from the products it returned, without calling the API when possible.
+    
+    Answers from the local product index (see `ProductIndex`) when an earlier search for the
+    same query, made within the index's ttl and price range, returned all of its results and at
+    least `min_results` of them match. Otherwise searches upstream with `text_search`, the keywords
+    added to the query.
+    
+    Args:
+        query (str): Query of an earlier search
+        price_min (int, optional): Minimum price for filtering products (default: 0)
+        price_max (int, optional): Maximum price for filtering products
+        keywords (str, optional): Words the product name, brand or store must contain
+        sort (str, optional): Sorting field: price:relevance
+        order (str, optional): Sorting order: asc or desc
+        count (int, optional): Maximum number of products returned (default: 20)
+        min_results (int, optional): Search upstream when fewer products match locally (default: 1)
+        
+    Returns:
+        dict: Search results with products matching the query
+    
+    Example:
+        agora.local_search("running shoes", price_max=100, keywords="trail", sort="price", order="asc")
+    """
+    products = self.index.search(query, price_min, price_max, keywords, sort, order, count) if self.index is not None else None
+    if products is not None and len(products) >= min_results: return _results_page(products)
+    return self.text_search(' '.join(filter(None, [query, keywords])), count=count, price_min=price_min,
+                            price_max=price_max, sort=sort, order=order)
+
+# %% ../nbs/00_core.ipynb 24
+def _image_files(body, content_type: str) -> dict:
+    return {'image': ('image.jpg' if content_type == 'image/jpeg' else 'image', body, content_type)}
+
+def _image_id(r: httpx.Response) -> str:
+    "`image_id` in an upload response"
+    d = Result(r).data if r.is_success else None
+    image_id = (d.get('imageId') or d.get('image_id') or d.get('id')) if isinstance(d, dict) else None
+    if image_id is None: raise ValueError(f"Failed to upload image: {r.text}")
+    return str(image_id)
+
+
+@patch
+def upload_image(self: Agora,
+                 image: str, # Image bytes, `data:` URL with the base64 bytes, or path of the image file
+                 max_side: int = 1024, # Longest side sent, in pixels
+                 quality: int = 85): # JPEG quality of a downscaled image
+    """
+    Upload an image for image search, or reuse the `image_id` of an earlier upload of the same image.
+    
+    Args:
+        image (str): Image bytes, `data:` URL with the base64 bytes (e.g. "data:image/jpeg;base64,/9j/..."),
+            or path of the image file, if the client's `ImageIds` accepts paths
+        max_side (int, optional): Longest side sent, in pixels. Larger images are downscaled
+            and re-encoded as JPEG when Pillow is installed (default: 1024)
+        quality (int, optional): JPEG quality of a downscaled image (default: 85)
+        
+    Returns:
+        str: The `image_id` to search with
+    
+    Example:
+        agora.upload_image("photos/shoes.jpg")
+    """
+    def send(body, content_type):
+        return _image_id(self._request('POST', path=self.image_upload_path, timeout=60, files=_image_files(body, content_type)))
+    return self.images.upload(image, send, max_side, quality)
+
+
+@patch
+def image_search(self: Agora,
+                 image: str, # Image bytes, `data:` URL with the base64 bytes, or path of the image file
+                 query: str = "", # Search query text to combine with the image
+                 count: int = 20, # Number of products per page (default: 20, max: 250)
+                 page: int = 1, # Page number for pagination (default: 1)
+                 price_min: int = 0, # Minimum price for filtering products
+                 price_max: int = None, # Maximum price for filtering products
+                 sort: str = None, # Sorting field: price:relevance
+                 order: str = None): # Sorting order: asc or desc
+    """
+    Search for products that look like an image.
+    
+    The image is uploaded once: later searches with the same image reuse its `image_id`.
+    
+    Args:
+        image (str): Image bytes, `data:` URL with the base64 bytes (e.g. "data:image/jpeg;base64,/9j/..."),
+            or path of the image file, if the client's `ImageIds` accepts paths
+        query (str, optional): Search query text to combine with the image
+        count (int, optional): Number of products per page (default: 20, max: 250)
+        page (int, optional): Page number for pagination (default: 1)
+        price_min (int, optional): Minimum price for filtering products (default: 0)
+        price_max (int, optional): Maximum price for filtering products
+        sort (str, optional): Sorting field: price:relevance
+        order (str, optional): Sorting order: asc or desc
+        
+    Returns:
+        dict: Search results with products matching the image
+    
+    Example:
+        agora.image_search("photos/shoes.jpg", "running shoes", price_max=200)
+    """
+    return self.text_search(query, count=count, page=page, price_min=price_min, price_max=price_max, sort=sort,
+                            order=order, image_id=self.upload_image(image))
+
+# %% ../nbs/00_core.ipynb 25
+def _merged(queries, res, sort, order, limit):
+    "Merged page of the search results `res`, or the first failure if every query failed"
+    pages = [r for r in res if not isinstance(r, Exception) and r.is_success]
+    if not pages and queries:
+        if isinstance(res[0], Exception): raise res[0]
+        return res[0]
+    return _results_page(merge_products([r.products for r in pages], sort, order, limit))
+
+
+@patch
+def multi_search(self: Agora,
+                 queries: List[str], # Search queries to run together
+                 count: int = 20, # Number of products fetched per query (max: 250)
+                 price_min: int = 0, # Minimum price for filtering products
+                 price_max: int = None, # Maximum price for filtering products
+                 sort: str = None, # Sorting field: price:relevance
+                 order: str = None, # Sorting order: asc or desc
+                 limit: int = None, # Maximum number of products returned
+                 trial: bool = False): # Use the trial search endpoint, which needs no API key
+    """
+    Run several searches concurrently and return their products as one deduplicated list.
+    
+    Products returned by more than one query appear once, matched by id or slug. They are
+    ordered by relevance, taking the best-ranked product of each query in turn, or by price
+    when `sort` mentions it. Queries that fail are left out.
+    
+    Args:
+        queries (list): Search queries to run together
+        count (int, optional): Number of products fetched per query (default: 20, max: 250)
+        price_min (int, optional): Minimum price for filtering products (default: 0)
+        price_max (int, optional): Maximum price for filtering products
+        sort (str, optional): Sorting field: price:relevance
+        order (str, optional): Sorting order: asc or desc
+        limit (int, optional): Maximum number of products returned
+        trial (bool, optional): Use the trial search endpoint, which needs no API key (default: False)
+        
+    Returns:
+        dict: Search results with the merged products. If every query failed, the response of the first one.
+    
+    Example:
+        agora.multi_search(["trail running shoes", "altra running shoes", "zero drop shoes"], price_max=200)
+    """
+    def fetch(q):
+        try:
+            if trial: return self.search_trial(q, price_min=price_min, price_max=price_max, sort=sort, order=order)
+            return self.text_search(q, count=count, price_min=price_min, price_max=price_max, sort=sort, order=order)
+        except Exception as e: return e
+    queries = list(dict.fromkeys(queries))
+    if not queries: return _results_page([])
+    with ThreadPoolExecutor(max_workers=min(8, len(queries))) as ex: res = list(ex.map(in_context(fetch), queries))
+    return _merged(queries, res, sort, order, limit)
 
 
-# %% ../nbs/00_core.ipynb 14
+# %% ../nbs/00_core.ipynb 27
 @patch
 def create_cart(self: Agora, 
                 custom_user_id: str = None, # Unique identifier for the user
@@ -185,9 +720,11 @@ def create_cart(self: Agora,
         data['items'] = items
     
     # Make the request
-    return self._request('POST', path='cart', headers=headers, json=data)
+    r = Cart(self._request('POST', path='cart', headers=headers, json=data))
+    if r.is_success: self.carts.update(custom_user_id, items or [], replace=True)
+    return r
 
-# %% ../nbs/00_core.ipynb 15
+# %% ../nbs/00_core.ipynb 28
 @patch
 def add_to_cart(self: Agora, 
                 product_id: str, # ID of the product to add
@@ -224,14 +761,70 @@ def add_to_cart(self: Agora,
     }
     
     # Make the PUT request
-    return self._request('PUT', path='cart', headers=headers, json=data)
+    r = Cart(self._request('PUT', path='cart', headers=headers, json=data))
+    if r.is_success: self.carts.update(custom_user_id, [data['product']])
+    return r
 
-# %% ../nbs/00_core.ipynb 16
+# %% ../nbs/00_core.ipynb 29
+@patch
+def add_items(self: Agora,
+              custom_user_id: str, # Unique identifier for the user
+              items: List[Dict]): # Items to add, each with `product`, `variantId` and `quantity`
+    """
+    Add several items to a user's cart, one request per distinct variant.
+    
+    Adds for the same user that arrive while a cart request is in flight are sent
+    together in the next round. The items are added to the upstream cart, never
+    replacing what it already holds. Items may carry `price` and `name`: they are not
+    sent upstream, but are kept in the local cart for `local_cart`.
+    
+    Args:
+        custom_user_id (str): Unique identifier for the user
+        items (list): Items to add, each a dict with:
+            - product (str): Product ID
+            - variantId (int): Variant ID of the product
+            - quantity (int, optional): Quantity of the product (default: 1)
+            - price (float, optional): Unit price, for the local cart total
+            - name (str, optional): Product name, for the local cart
+            
+    Returns:
+        dict: Response of the last add, or of the first one that failed
+    
+    Example:
+        agora.add_items("user123", [
+            {"product": "678f71a9356a36f784ee2e88", "variantId": 2061038485517, "quantity": 2, "price": 89.9},
+            {"product": "677df599770698bbe867b39f", "variantId": 2061038485520, "quantity": 1, "price": 15}
+        ])
+    """
+    def send(user, line): return Cart(self._request('PUT', path='cart', headers={'customuserid': user} if user else {}, json={'product': line}))
+    return self.carts.add(custom_user_id, items, send)
+
+
+@patch
+def local_cart(self: _AgoraBase,
+               custom_user_id: str = None): # Unique identifier for the user
+    """
+    Contents and totals of a user's cart, as built through this client, without calling the API.
+    
+    Args:
+        custom_user_id (str, optional): Unique identifier for the user
+        
+    Returns:
+        dict: `items` (product, variantId, quantity and any price/name given when adding),
+              `count` (units in the cart) and `total` (sum of price * quantity)
+    
+    Example:
+        agora.local_cart("user123")
+    """
+    return self.carts.get(custom_user_id).to_dict()
+
+# %% ../nbs/00_core.ipynb 30
 @patch
 def create_order(self: Agora, 
                 encrypted_payment_info: str, # Encrypted payment information
                 shipping_address: Dict[str, str], # Dictionary containing shipping address details
-                current_user: Dict[str, str]): # Dictionary containing user information
+                current_user: Dict[str, str], # Dictionary containing user information
+                idempotency_key: str = None): # Key that makes retries of this order safe
     """
     Create a new order from cart items.
     
@@ -249,6 +842,8 @@ def create_order(self: Agora,
             - lastname (str): User's last name
             - email (str): User's email address
             - _id (str): User's ID
+        idempotency_key (str, optional): Sent as the `Idempotency-Key` header. Without it a
+            failed order is never retried, since it could be placed twice.
             
     Returns:
         dict: Order creation response with success status and order ID
@@ -279,10 +874,12 @@ def create_order(self: Agora,
         "currentUser": current_user
     }
     
+    headers = {'Idempotency-Key': idempotency_key} if idempotency_key else {}
+    
     # Make the POST request
-    return self._request('POST', path='order', json=data)
+    return Order(self._request('POST', path='order', headers=headers, json=data))
 
-# %% ../nbs/00_core.ipynb 17
+# %% ../nbs/00_core.ipynb 31
 @patch
 def track_order(self: Agora, 
                order_id: str): # Unique identifier of the order to track
@@ -299,9 +896,43 @@ def track_order(self: Agora,
         agora.track_order("67c8577b3e370f07d12c7722")
     """
     # Make the GET request
-    return self._request('GET', path=f'order-tracking/{order_id}')
+    return Tracking(self._request('GET', path=f'order-tracking/{order_id}'))
 
-# %% ../nbs/00_core.ipynb 18
+
+@patch(as_prop=True)
+def orders(self: _AgoraBase):
+    "`OrderWatcher` over `track_order`, shared by the `watch_orders` calls"
+    if self._orders is None: self._orders = OrderWatcher(self.track_order)
+    return self._orders
+
+
+@patch
+def watch_orders(self: Agora,
+                 order_ids: List[str], # Unique identifiers of the orders to watch
+                 timeout: float = 60): # Seconds to wait for a status change
+    """
+    Watch several orders and return the ones whose status changed.
+    
+    The orders are polled together, less often the longer they stay unchanged (see `OrderWatcher`).
+    Each status change is returned once: the first call reports the current status of every order,
+    later calls only what changed since.
+    
+    Args:
+        order_ids (list): Unique identifiers of the orders to watch
+        timeout (float, optional): Seconds to wait for a status change (default: 60)
+        
+    Returns:
+        list: Changes, each with `order_id`, `status`, `previous` status and the `tracking` details.
+              Empty if no order changed within `timeout`, or before the `deadline` if sooner.
+    
+    Example:
+        agora.watch_orders(["67c8577b3e370f07d12c7722", "67c8577b3e370f07d12c7723"], timeout=30)
+    """
+    # The watcher is async: it gets a loop of its own, whether or not the caller's thread runs one
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        return ex.submit(in_context(asyncio.run), self.orders.wait(order_ids, bounded(timeout))).result()
+
+# %% ../nbs/00_core.ipynb 32
 @patch
 def refresh_token(self: Agora, 
                  refresh_token_str: str): # The refresh token to validate
@@ -312,9 +943,11 @@ def refresh_token(self: Agora,
         refresh_token_str (str): The refresh token to validate and retrieve
                                a new API key and refresh token
         
+    The new API key is used for the following requests.
+    
     Returns:
-        dict: Object containing new API key, refresh token, and expiration time
-              with the following structure:
+        TokenRefresh: Response whose `credentials` hold the new API key, refresh token,
+              and expiration time. The JSON body has the following structure:
               {
                 "status": "success",
                 "data": {
@@ -330,17 +963,30 @@ def refresh_token(self: Agora,
     # Prepare request body
     data = {"refreshToken": refresh_token_str}
     
-    # Make the POST request (using direct httpx call since we don't need auth here)
-    r = httpx.post(f'{self.base_url}/refresh-token', json=data)
-    response = dict2obj(r.json())
+    # Make the POST request (no auth needed here)
+    r = TokenRefresh(self._request('POST', path='refresh-token', auth=False, json=data))
     
     # Check for errors
-    if r.status_code != 200 or response.status == "error":
-        raise ValueError(response.message)
-        
-    return response
+    if r.status_code != 200 or r.status == "error":
+        raise ValueError(r.message)
+    
+    self._store_credentials(r.credentials)
+    return r
+
+# %% ../nbs/00_core.ipynb 33
+def _offer(offer_id, amount, title, description, currency="USD"):
+    "Build a one-off Fewsats offer payable with lightning or credit card"
+    return {
+        "offer_id": offer_id,
+        "amount": amount,
+        "currency": currency,
+        "title": title,
+        "description": description,
+        "payment_methods": ["lightning", "credit_card"],
+        'type': 'one-off'
+    }
+
 
-# %% ../nbs/00_core.ipynb 19
 @patch
 def create_payment_intent(self: Agora,
                          offer_id: str, # Unique identifier for this offer (can be variant_id for items or user_id for carts)
@@ -371,34 +1017,450 @@ def create_payment_intent(self: Agora,
     """
     
     # Create offer data
-    offers_data = [{
-        "offer_id": offer_id,
-        "amount": amount,
-        "currency": currency,
-        "title": title,
-        "description": description,
-        "payment_methods": ["lightning", "credit_card"],
-        'type': 'one-off'
-    }]
+    offers_data = [_offer(offer_id, amount, title, description, currency)]
     
-    fs = Fewsats()
-    r = fs.create_offers(offers_data)
+    # A retry with the same offer gets the intent created the first time
+    r = self.payments.create(offers_data, self._create_offers)
     if not r.is_success:
         raise ValueError(f"Failed to create payment intent: {r.text}")
     
     return r
 
-# %% ../nbs/00_core.ipynb 22
+
+@patch
+def create_payment_intents(self: Agora,
+                           offers: List[Dict]): # Offers, each with `offer_id`, `amount`, `title`, `description` and optionally `currency`
+    """
+    Create one payment intent covering several offers, in a single request.
+    
+    Args:
+        offers (list): Offers to create, each a dict with:
+            - offer_id (str): Unique identifier for this offer (variant_id for items, user_id for carts)
+            - amount (int): Payment amount in cents
+            - title (str): Offer title
+            - description (str): Offer description
+            - currency (str, optional): Payment currency (default: USD)
+        
+    Returns:
+        dict: Created payment options for all the offers.
+    
+    Example:
+        agora.create_payment_intents([
+            {"offer_id": "cart-user123", "amount": 1999, "title": "Cart", "description": "Altra Escalanta v4"},
+            {"offer_id": "cart-user456", "amount": 1500, "title": "Cart", "description": "Kaleidoscope Glasses"}
+        ])
+    """
+    r = self.payments.create([_offer(**o) for o in offers], self._create_offers)
+    if not r.is_success:
+        raise ValueError(f"Failed to create payment intents: {r.text}")
+    return r
+
+# %% ../nbs/00_core.ipynb 37
+class AsyncAgora(_AgoraBase):
+    "Async client for interacting with the Agora API"
+    _client_cls, _transport_cls = httpx.AsyncClient, httpx.AsyncHTTPTransport
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._writes = set()
+
+    async def aclose(self,
+                     timeout: float = 30.): # Seconds to wait for the writes in flight
+        "Wait for the writes in flight, then close the underlying connection pool"
+        if self._writes: await asyncio.wait(set(self._writes), timeout=timeout)
+        await self._httpx_client.aclose()
+        if self._fewsats is not None: self._fewsats._httpx_client.close()
+        if self.cassette is not None: self.cassette.close()
+
+    async def __aenter__(self): return self
+    async def __aexit__(self, *args): await self.aclose()
+
+# %% ../nbs/00_core.ipynb 38
+@patch
+async def _request(self: AsyncAgora,
+                   method: str, # The HTTP method to use
+                   path: str, # The path to request
+                   timeout: float = None, # Timeout for the request in s, defaults to the client's `timeout`
+                   auth: bool = True, # Send the Authorization header
+                   **kwargs) -> httpx.Response:
+    "Makes an authenticated request to Agora API"
+    if auth: await self._check_credentials()
+    req = self._build_request(method, path, timeout=timeout, auth=auth, **kwargs)
+    key = self._cache_key(method, path, kwargs.get('params'))
+    if key is not None:
+        r = await self.cache.aget(key, req)
+        self.instrumentation.cache(_endpoint(path), r is not None)
+        if r is not None: return r
+    async def send():
+        r = await self._send(req, _endpoint(path))
+        if self._refreshable(r, auth):
+            await self.credentials.arefresh(_stale_key(req), self._new_credentials)
+            req.headers['Authorization'] = self._httpx_client.headers['Authorization']
+            r = await self._send(req, _endpoint(path))
+        if key is not None: await self.cache.aset(key, r)
+        return r
+    if method != 'GET': return await self._write(send())
+    if self._flights is None: return await send()
+    return await self._flights.ado(request_key(path, kwargs.get('params')), send, _endpoint(path))
+
+
+@patch
+async def _write(self: AsyncAgora, aw):
+    "Await `aw` to completion even if the caller is cancelled, so that `aclose` can wait for it"
+    fut = asyncio.ensure_future(aw)
+    self._writes.add(fut)
+    fut.add_done_callback(self._write_done)
+    return await asyncio.shield(fut)
+
+
+@patch
+def _write_done(self: AsyncAgora, fut):
+    self._writes.discard(fut)
+    # Its caller may have been cancelled: the error is still theirs, don't log it as never retrieved
+    if not fut.cancelled(): fut.exception()
+
+
+@patch
+async def _check_credentials(self: AsyncAgora):
+    "Refresh the API key when it is about to expire. See `Agora._check_credentials`"
+    c = self.credentials
+    if c is None or not c.due(): return
+    if c.expires_in() > 0: c.arefresh_in_background(c.api_key, self._new_credentials)
+    else: await c.arefresh(c.api_key, self._new_credentials)
+
+
+@patch
+async def _new_credentials(self: AsyncAgora, refresh_token: str) -> Credentials:
+    return (await self.refresh_token(refresh_token)).credentials
+
+
+@patch
+async def _send(self: AsyncAgora, req: httpx.Request, endpoint: str) -> httpx.Response:
+    "Send `req`, retrying transient failures and keeping the endpoint's circuit breaker up to date"
+    breaker, attempt, timeout = self.breakers[endpoint], 0, req.extensions.get('timeout')
+    while True:
+        if not breaker.allow(): raise CircuitOpenError(endpoint, breaker.retry_in())
+        attempt += 1
+        try: r = await self._attempt(req, endpoint, attempt, timeout)
+        except httpx.TransportError as e:
+            if _cut_short(e, req, timeout): breaker.release(); raise DeadlineExceeded(endpoint) from e
+            breaker.record(False)
+            check(endpoint)
+            delay = self.retry.delay(attempt)
+            if not self.retry.retryable(req, attempt, error=e) or not fits(delay): raise
+            await asyncio.sleep(delay)
+            continue
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record(r.status_code < 500)
+        if not self.retry.retryable(req, attempt, response=r): return r
+        delay = self.retry.delay(attempt, r)
+        if not fits(delay): return r
+        await r.aclose()
+        await asyncio.sleep(delay)
+
+
+@patch
+async def _attempt(self: AsyncAgora, req: httpx.Request, endpoint: str, attempt: int, timeout: dict) -> httpx.Response:
+    "One attempt at `req`. See `Agora._attempt`."
+    if self.rate_limiter is not None and not await self.rate_limiter.aacquire(endpoint, timeout=bounded(None)):
+        raise DeadlineExceeded(endpoint)
+    read = req.method == 'GET'
+    if read: req.extensions['timeout'] = clip_timeout(timeout, endpoint)
+    else: check(endpoint)
+    async with self.scheduler.aslot(endpoint) if self.scheduler is not None else nullcontext():
+        span = self._span(req, endpoint, attempt)
+        # A read is cancelled at the deadline, which gives its connection back to the pool. A write never is.
+        try: r = await (within(self._httpx_client.send(req), endpoint) if read else self._httpx_client.send(req))
+        except BaseException as e:
+            self.instrumentation.end(span, error=e)
+            raise
+    self.instrumentation.end(span, response=r)
+    return r
+
+
+@patch
+async def search_trial(self: AsyncAgora,
+                       query: str, # Search query text
+                       price_min: int = 0, # Minimum price for filtering products
+                       price_max: int = None, # Maximum price for filtering products
+                       sort: str = None, # Sorting field: price:relevance
+                       order: str = None): # Sorting order: asc or desc
+    "Search for products using the trial endpoint. See `Agora.search_trial`."
+    params = _search_params(query, price_min, price_max, sort, order)
+    return self._indexed(SearchResults(await self._request('GET', path='search/trial', auth=False, params=params)), params)
+
+
+@patch
+async def text_search(self: AsyncAgora,
+                      query: str, # Search query text
+                      count: int = 20, # Number of products per page (default: 20, max: 250)
+                      page: int = 1, # Page number for pagination (default: 1)
+                      price_min: int = 0, # Minimum price for filtering products
+                      price_max: int = None, # Maximum price for filtering products
+                      sort: str = None, # Sorting field: price:relevance
+                      order: str = None, # Sorting order: asc or desc
+                      image_id: str = None): # Image search identifier
+    "Search for products with full functionality. See `Agora.text_search`."
+    params = _search_params(query, price_min, price_max, sort, order, count=count, page=page)
+    if image_id: params['imageId'] = image_id
+    return self._indexed(SearchResults(await self._request('GET', path='search', params=params)), params)
+
+
+@patch
+async def iter_search(self: AsyncAgora,
+                      query: str, # Search query text
+                      count: int = 100, # Number of products fetched per page (max: 250)
+                      price_min: int = 0, # Minimum price for filtering products
+                      price_max: int = None, # Maximum price for filtering products
+                      sort: str = None, # Sorting field: price:relevance
+                      order: str = None, # Sorting order: asc or desc
+                      image_id: str = None, # Image search identifier
+                      max_items: int = None): # Stop after this many products
+    "Iterate over all the products matching a search, page by page. See `Agora.iter_search`."
+    async def fetch(page):
+        return _page_products(await self.text_search(query, count=count, page=page, price_min=price_min,
+                                                     price_max=price_max, sort=sort, order=order, image_id=image_id))
+    page, n = 1, 0
+    task = asyncio.ensure_future(fetch(page))
+    try:
+        while True:
+            products = await task
+            last = len(products) < count
+            if not last and (max_items is None or n + len(products) < max_items):
+                page += 1
+                task = asyncio.ensure_future(fetch(page))
+            for p in products:
+                if max_items is not None and n >= max_items: return
+                yield p
+                n += 1
+            if last or (max_items is not None and n >= max_items): return
+    finally: task.cancel()
+
+
+@patch
+async def get_product_detail(self: AsyncAgora,
+                             slug: str): # The unique identifier of the product to retrieve
+    "Retrieve detailed information about a specific product. See `Agora.get_product_detail`."
+    return self._indexed(ProductDetail(await self._request('GET', path='product-detail', params={'slug': slug})))
+
+
+@patch
+async def get_product_details(self: AsyncAgora,
+                              slugs: List[str], # Unique identifiers of the products to retrieve
+                              concurrency: int = 8): # Maximum number of requests in flight
+    "Retrieve detailed information about several products concurrently. See `Agora.get_product_details`."
+    if concurrency < 1: raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    unique = list(dict.fromkeys(slugs))
+    sem = asyncio.Semaphore(concurrency)
+    async def fetch(slug):
+        async with sem: return await self.get_product_detail(slug)
+    res = await asyncio.gather(*map(fetch, unique), return_exceptions=True)
+    return dict(zip(unique, res))
+
+
+@patch
+async def local_search(self: AsyncAgora,
+                       query: str, # Query of an earlier search
+                       price_min: int = 0, # Minimum price for filtering products
+                       price_max: int = None, # Maximum price for filtering products
+                       keywords: str = None, # Words the product name, brand or store must contain
+                       sort: str = None, # Sorting field: price:relevance
+                       order: str = None, # Sorting order: asc or desc
+                       count: int = 20, # Maximum number of products returned
+                       min_results: int = 1): # Search upstream when fewer products match locally
+    "Refine an earlier search from the products it returned. See `Agora.local_search`."
+    products = self.index.search(query, price_min, price_max, keywords, sort, order, count) if self.index is not None else None
+    if products is not None and len(products) >= min_results: return _results_page(products)
+    return await self.text_search(' '.join(filter(None, [query, keywords])), count=count, price_min=price_min,
+                                  price_max=price_max, sort=sort, order=order)
+
+
+@patch
+async def upload_image(self: AsyncAgora,
+                       image: str, # Image bytes, `data:` URL with the base64 bytes, or path of the image file
+                       max_side: int = 1024, # Longest side sent, in pixels
+                       quality: int = 85): # JPEG quality of a downscaled image
+    "Upload an image for image search, or reuse the `image_id` of an earlier upload. See `Agora.upload_image`."
+    async def send(body, content_type):
+        r = await self._request('POST', path=self.image_upload_path, timeout=60, files=_image_files(body, content_type))
+        return _image_id(r)
+    return await self.images.aupload(image, send, max_side, quality)
+
+
+@patch
+async def image_search(self: AsyncAgora,
+                       image: str, # Image bytes, `data:` URL with the base64 bytes, or path of the image file
+                       query: str = "", # Search query text to combine with the image
+                       count: int = 20, # Number of products per page (default: 20, max: 250)
+                       page: int = 1, # Page number for pagination (default: 1)
+                       price_min: int = 0, # Minimum price for filtering products
+                       price_max: int = None, # Maximum price for filtering products
+                       sort: str = None, # Sorting field: price:relevance
+                       order: str = None): # Sorting order: asc or desc
+    "Search for products that look like an image. See `Agora.image_search`."
+    return await self.text_search(query, count=count, page=page, price_min=price_min, price_max=price_max, sort=sort,
+                                  order=order, image_id=await self.upload_image(image))
+
+
+@patch
+async def multi_search(self: AsyncAgora,
+                       queries: List[str], # Search queries to run together
+                       count: int = 20, # Number of products fetched per query (max: 250)
+                       price_min: int = 0, # Minimum price for filtering products
+                       price_max: int = None, # Maximum price for filtering products
+                       sort: str = None, # Sorting field: price:relevance
+                       order: str = None, # Sorting order: asc or desc
+                       limit: int = None, # Maximum number of products returned
+                       trial: bool = False): # Use the trial search endpoint, which needs no API key
+    "Run several searches concurrently and return their products as one deduplicated list. See `Agora.multi_search`."
+    queries = list(dict.fromkeys(queries))
+    if trial: aws = [self.search_trial(q, price_min=price_min, price_max=price_max, sort=sort, order=order) for q in queries]
+    else: aws = [self.text_search(q, count=count, price_min=price_min, price_max=price_max, sort=sort, order=order) for q in queries]
+    return _merged(queries, await asyncio.gather(*aws, return_exceptions=True), sort, order, limit)
+
+# %% ../nbs/00_core.ipynb 39
+@patch
+async def create_cart(self: AsyncAgora,
+                      custom_user_id: str = None, # Unique identifier for the user
+                      items: List[Dict] = None): # List of items to add to the cart
+    "Create a new cart for a user. See `Agora.create_cart`."
+    headers = {'customuserid': custom_user_id} if custom_user_id else {}
+    data = {'items': items} if items else {}
+    r = Cart(await self._request('POST', path='cart', headers=headers, json=data))
+    if r.is_success: self.carts.update(custom_user_id, items or [], replace=True)
+    return r
+
+
+@patch
+async def add_to_cart(self: AsyncAgora,
+                      product_id: str, # ID of the product to add
+                      variant_id: str, # Variant ID of the product
+                      quantity: int = 1, # Quantity of the product (default: 1)
+                      custom_user_id: str = None): # Unique identifier for the user
+    "Add a product to an existing cart. See `Agora.add_to_cart`."
+    headers = {'customuserid': custom_user_id} if custom_user_id else {}
+    data = {"product": {"product": product_id, "variantId": variant_id, "quantity": quantity}}
+    r = Cart(await self._request('PUT', path='cart', headers=headers, json=data))
+    if r.is_success: self.carts.update(custom_user_id, [data['product']])
+    return r
+
+
+@patch
+async def add_items(self: AsyncAgora,
+                    custom_user_id: str, # Unique identifier for the user
+                    items: List[Dict]): # Items to add, each with `product`, `variantId` and `quantity`
+    "Add several items to a user's cart, one request per distinct variant. See `Agora.add_items`."
+    async def send(user, line): return Cart(await self._request('PUT', path='cart', headers={'customuserid': user} if user else {}, json={'product': line}))
+    return await self.carts.aadd(custom_user_id, items, send)
+
+
+@patch
+async def create_order(self: AsyncAgora,
+                       encrypted_payment_info: str, # Encrypted payment information
+                       shipping_address: Dict[str, str], # Dictionary containing shipping address details
+                       current_user: Dict[str, str], # Dictionary containing user information
+                       idempotency_key: str = None): # Key that makes retries of this order safe
+    "Create a new order from cart items. See `Agora.create_order`."
+    data = {
+        "encryptedPaymentInfo": encrypted_payment_info,
+        "shippingAddress": shipping_address,
+        "currentUser": current_user
+    }
+    headers = {'Idempotency-Key': idempotency_key} if idempotency_key else {}
+    return Order(await self._request('POST', path='order', headers=headers, json=data))
+
+
+@patch
+async def track_order(self: AsyncAgora,
+                      order_id: str): # Unique identifier of the order to track
+    "Track an existing order by its ID. See `Agora.track_order`."
+    return Tracking(await self._request('GET', path=f'order-tracking/{order_id}'))
+
+
+@patch
+async def watch_orders(self: AsyncAgora,
+                       order_ids: List[str], # Unique identifiers of the orders to watch
+                       timeout: float = 60): # Seconds to wait for a status change
+    "Watch several orders and return the ones whose status changed. See `Agora.watch_orders`."
+    return await self.orders.wait(order_ids, bounded(timeout))
+
+# %% ../nbs/00_core.ipynb 40
+@patch
+async def refresh_token(self: AsyncAgora,
+                        refresh_token_str: str): # The refresh token to validate
+    "Refresh API key and token by providing a valid refresh token. See `Agora.refresh_token`."
+    r = TokenRefresh(await self._request('POST', path='refresh-token', auth=False, json={"refreshToken": refresh_token_str}))
+    if r.status_code != 200 or r.status == "error":
+        raise ValueError(r.message)
+    self._store_credentials(r.credentials)
+    return r
+
+
+@patch
+async def create_payment_intent(self: AsyncAgora,
+                                offer_id: str, # Unique identifier for this offer (can be variant_id for items or user_id for carts)
+                                amount: int, # Payment amount in cents
+                                title: str, # Offer title
+                                description: str, # Offer description
+                                currency: str = "USD"):  # Payment currency
+    "Create a payment intent for a product or cart. See `Agora.create_payment_intent`."
+    offers_data = [_offer(offer_id, amount, title, description, currency)]
+    # The Fewsats client is synchronous, so keep it off the event loop
+    self.fewsats # Created here rather than racing in the executor threads
+    r = await self._write(asyncio.get_running_loop().run_in_executor(None, self.payments.create, offers_data, self._create_offers))
+    if not r.is_success:
+        raise ValueError(f"Failed to create payment intent: {r.text}")
+    return r
+
+
+@patch
+async def create_payment_intents(self: AsyncAgora,
+                                 offers: List[Dict]): # Offers, each with `offer_id`, `amount`, `title`, `description` and optionally `currency`
+    "Create one payment intent covering several offers, in a single request. See `Agora.create_payment_intents`."
+    offers_data = [_offer(**o) for o in offers]
+    self.fewsats
+    r = await self._write(asyncio.get_running_loop().run_in_executor(None, self.payments.create, offers_data, self._create_offers))
+    if not r.is_success:
+        raise ValueError(f"Failed to create payment intents: {r.text}")
+    return r
+
+# %% ../nbs/00_core.ipynb 48
+@patch
+def stats(self: _AgoraBase):
+    """
+    Current client metrics, for monitoring.
+    
+    Returns:
+        dict: Per-endpoint request counts, latency percentiles, status and error counts, bytes
+              sent and received, retries and cache hits under `metrics`, the circuit breaker
+              state under `breakers`, the response cache counters under `cache` and the requests
+              in flight, waiting and shed of each priority class under `scheduler`.
+    """
+    return dict(metrics=self.instrumentation.metrics.snapshot(), breakers=self.breakers.state(),
+                cache=self.cache.stats if self.cache is not None else None,
+                scheduler=self.scheduler.stats if self.scheduler is not None else None)
+
+# %% ../nbs/00_core.ipynb 49
 @patch
-def as_tools(self:Agora):
+def as_tools(self:_AgoraBase):
     "Return list of available tools for AI agents"
+    # Not `refresh_token`: a tool call must not be able to replace the client's API key and stored credentials
     return [
         self.search_trial,
         self.get_product_detail,
+        self.get_product_details,
+        self.multi_search,
+        self.local_search,
+        self.image_search,
         self.create_cart,
         self.add_to_cart,
+        self.add_items,
+        self.local_cart,
         self.create_order,
         self.track_order,
-        self.refresh_token,
-        self.create_payment_intent
+        self.watch_orders,
+        self.create_payment_intent,
+        self.create_payment_intents
     ]
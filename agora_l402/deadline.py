@@ -0,0 +1,80 @@
+"""Time budgets that follow a call down to its HTTP requests"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/18_deadline.ipynb.
+
+# %% auto 0
+__all__ = ['DeadlineExceeded', 'deadline', 'no_deadline', 'remaining', 'bounded', 'check', 'fits', 'clip_timeout', 'within', 'in_context']
+
+# %% ../nbs/18_deadline.ipynb 3
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+# %% ../nbs/18_deadline.ipynb 5
+class DeadlineExceeded(TimeoutError):
+    "The time budget of a call ran out before it could finish"
+    def __init__(self, endpoint: str = None):
+        super().__init__(f"Deadline exceeded before '{endpoint}' could finish" if endpoint else "Deadline exceeded")
+        self.endpoint = endpoint
+
+
+_deadline = contextvars.ContextVar('agora_deadline', default=None) # `time.monotonic()` at which the budget ends
+
+@contextmanager
+def deadline(seconds: float): # Time budget of the calls made in the block, `None` to keep the enclosing one
+    "Give the calls made in the block at most `seconds`, or less if an enclosing deadline is sooner"
+    at, cur = None if seconds is None else time.monotonic() + seconds, _deadline.get()
+    token = _deadline.set(at if cur is None else cur if at is None else min(cur, at))
+    try: yield
+    finally: _deadline.reset(token)
+
+@contextmanager
+def no_deadline():
+    "Run the block without the enclosing deadline"
+    token = _deadline.set(None)
+    try: yield
+    finally: _deadline.reset(token)
+
+def remaining() -> float:
+    "Seconds left before the current deadline, `None` without one"
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+def bounded(seconds: float) -> float:
+    "`seconds`, or the time left if the deadline is sooner (`None` stands for no limit)"
+    left = remaining()
+    if left is None: return seconds
+    left = max(left, 0.)
+    return left if seconds is None else min(seconds, left)
+
+def check(endpoint: str = None):
+    "Raise `DeadlineExceeded` if the current deadline has passed"
+    left = remaining()
+    if left is not None and left <= 0: raise DeadlineExceeded(endpoint)
+
+def fits(delay: float) -> bool:
+    "Whether waiting `delay` seconds still leaves time before the deadline"
+    left = remaining()
+    return left is None or delay < left
+
+def clip_timeout(timeout: dict, # httpx timeout extension of a request: `connect`, `read`, `write` and `pool` seconds
+                 endpoint: str = None) -> dict:
+    "`timeout` with every phase cut to the time left, raising `DeadlineExceeded` if there is none"
+    check(endpoint)
+    if _deadline.get() is None: return timeout
+    return {k: bounded(v) for k, v in (timeout or dict.fromkeys(('connect', 'read', 'write', 'pool'))).items()}
+
+async def within(aw, endpoint: str = None):
+    "Await `aw`, cancelling it and raising `DeadlineExceeded` when the deadline passes"
+    left = remaining()
+    if left is None: return await aw
+    try: return await asyncio.wait_for(aw, max(left, 0.))
+    except DeadlineExceeded: raise
+    except asyncio.TimeoutError: raise DeadlineExceeded(endpoint) from None
+
+def in_context(f: Callable) -> Callable:
+    "`f`, run in a copy of the caller's context, and so within its deadline, from whichever thread calls it"
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.copy().run(f, *args, **kwargs)
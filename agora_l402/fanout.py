@@ -0,0 +1,35 @@
+"""Merge the results of several searches into one deduplicated list"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/15_fanout.ipynb.
+
+# %% auto 0
+__all__ = ['interleave', 'dedupe', 'merge_products']
+
+# %% ../nbs/15_fanout.ipynb 3
+from typing import List
+from .models import Product
+from .index import sort_by_price
+
+# %% ../nbs/15_fanout.ipynb 5
+def interleave(pages: List[List[Product]]) -> List[Product]:
+    "Products of `pages` by rank: the first of each page, then the second of each, ..."
+    return [p for rank in range(max(map(len, pages), default=0)) for page in pages if rank < len(page) for p in [page[rank]]]
+
+def dedupe(products: List[Product]) -> List[Product]:
+    "`products` without the ones whose id or slug came earlier"
+    seen, res = set(), []
+    for p in products:
+        keys = {k for k in (('id', p.id), ('slug', p.slug)) if k[1] is not None}
+        if keys & seen: continue
+        seen |= keys
+        res.append(p)
+    return res
+
+def merge_products(pages: List[List[Product]], # Products of each search, in their ranking
+                   sort: str = None, # `price` (or any value containing it) sorts by price, otherwise results are interleaved
+                   order: str = None, # `asc` or `desc`
+                   limit: int = None) -> List[Product]: # Maximum number of products returned
+    "One deduplicated list of the products of several searches"
+    res = dedupe(interleave(pages))
+    if sort and 'price' in sort: res = sort_by_price(res, order)
+    return res[:limit]
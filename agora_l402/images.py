@@ -0,0 +1,145 @@
+"""Prepare, upload and remember images for image search"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/14_images.ipynb.
+
+# %% auto 0
+__all__ = ['ImageSource', 'open_image', 'content_type', 'check_image', 'downscale', 'ImageIds']
+
+# %% ../nbs/14_images.ipynb 3
+import asyncio
+import base64
+import hashlib
+import io
+import mmap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Union
+from .cache import MemoryBackend, SingleFlight, offload
+
+# %% ../nbs/14_images.ipynb 5
+ImageSource = Union[str, Path, bytes]
+
+def _allowed(path, paths) -> bool:
+    "Whether `paths` (`True`, `False` or a directory) lets an image be read from `path`"
+    if paths is True or paths is False: return paths
+    root, p = Path(paths).resolve(), Path(path).resolve()
+    return p == root or root in p.parents
+
+@contextmanager
+def open_image(image: ImageSource, # Image bytes, `data:` URL of them, or path of an image file
+               paths: Union[bool, str, Path] = True): # Paths accepted: any (`True`), none (`False`) or those inside this directory
+    "Contents of `image`: the bytes themselves, decoded from a `data:` URL, or the file at that path, memory-mapped"
+    if isinstance(image, (bytes, bytearray, memoryview)): yield image; return
+    if isinstance(image, str) and image.startswith('data:'):
+        try: data = base64.b64decode(image.partition(',')[2], validate=True)
+        except ValueError: raise ValueError('The image data URL is not valid base64') from None
+        yield data; return
+    if not _allowed(image, paths): raise ValueError(f"Reading images from '{image}' is not allowed, pass the image bytes or a data: URL of them instead")
+    with open(image, 'rb') as f:
+        if not Path(image).stat().st_size: raise ValueError(f"'{image}' is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm: yield mm
+
+_magic = [(b'\xff\xd8\xff', 'image/jpeg'), (b'\x89PNG', 'image/png'), (b'GIF8', 'image/gif'), (b'BM', 'image/bmp')]
+
+def content_type(data) -> str:
+    "MIME type of the image `data`, from its first bytes"
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP': return 'image/webp'
+    return next((t for m, t in _magic if data[:len(m)] == m), 'application/octet-stream')
+
+def check_image(data):
+    "Raise `ValueError` unless `data` is an image: decoded with Pillow if it's installed, else recognized by its first bytes"
+    if not len(data): raise ValueError('The image is empty')
+    try: from PIL import Image
+    except ImportError:
+        if content_type(data) == 'application/octet-stream': raise ValueError('Not an image, or in an unknown format') from None
+        return
+    try:
+        with Image.open(io.BytesIO(data) if not isinstance(data, mmap.mmap) else data) as im: im.verify()
+    except Exception as e: raise ValueError(f'Not an image: {e}') from None
+    finally:
+        if isinstance(data, mmap.mmap): data.seek(0)
+
+def downscale(data, # Image bytes, or a memory-mapped file
+              max_side: int = 1024, # Longest side of the result, in pixels
+              quality: int = 85): # JPEG quality of the result
+    "JPEG of `data` scaled to fit `max_side`, or `None` if Pillow is missing, can't read it, or it's best sent as is"
+    try: from PIL import Image, ImageOps # Optional, and only needed once an image is uploaded
+    except ImportError: return None
+    try:
+        with Image.open(io.BytesIO(data) if not isinstance(data, mmap.mmap) else data) as im:
+            # Re-encoding a JPEG that already fits would cost quality for few bytes
+            if im.format == 'JPEG' and max(im.size) <= max_side: return None
+            im.draft('RGB', (max_side, max_side)) # JPEGs decode straight at a reduced scale
+            im = ImageOps.exif_transpose(im)
+            if im.mode in ('RGBA', 'LA', 'P'):
+                im = im.convert('RGBA')
+                bg = Image.new('RGB', im.size, 'white')
+                bg.paste(im, mask=im.getchannel('A'))
+                im = bg
+            im = im.convert('RGB')
+            im.thumbnail((max_side, max_side))
+            out = io.BytesIO()
+            im.save(out, 'JPEG', quality=quality, optimize=True)
+    except Exception: return None
+    finally:
+        if isinstance(data, mmap.mmap): data.seek(0)
+    return out.getvalue() if out.tell() < len(data) else None
+
+# %% ../nbs/14_images.ipynb 7
+class ImageIds:
+    "Image ids returned by the upload endpoint, by content hash of the image"
+    def __init__(self,
+                 ttl: float = 86400, # Seconds an `image_id` is reused
+                 backend = None, # Storage with `get`/`set`, defaults to `MemoryBackend(1024)`, e.g. `SQLiteBackend` to share it
+                 paths: Union[bool, str, Path] = True): # Image paths accepted: any (`True`), none (`False`) or those inside this directory
+        self.ttl, self.paths = ttl, paths
+        self.backend = backend if backend is not None else MemoryBackend(1024)
+        self._flights = SingleFlight()
+
+    @staticmethod
+    def key(data, max_side: int, quality: int) -> str:
+        "Identity of an upload of `data` prepared with `max_side` and `quality`"
+        return f'image:{hashlib.sha256(data).hexdigest()}:{max_side}:{quality}'
+
+    def get(self, key: str) -> str:
+        v = self.backend.get(key)
+        return v.decode() if v is not None else None
+
+    def _prepare(self, data, max_side, quality):
+        "Body of the upload, downscaled if that helps, and its content type"
+        check_image(data) # only before an upload: an image with an `image_id` was checked then
+        small = downscale(data, max_side, quality)
+        return (small, 'image/jpeg') if small is not None else (data, content_type(data))
+
+    def _upload(self, key, data, send, max_side, quality):
+        image_id = self.get(key)
+        if image_id is None:
+            image_id = send(*self._prepare(data, max_side, quality))
+            self.backend.set(key, image_id.encode(), self.ttl)
+        return image_id
+
+    def upload(self,
+               image: ImageSource, # Image bytes, `data:` URL of them, or path of an image file
+               send: Callable, # `send(body, content_type)` uploads the image and returns its `image_id`
+               max_side: int = 1024, # Longest side sent, in pixels
+               quality: int = 85): # JPEG quality of a downscaled image
+        "`image_id` of `image`: the one it got before if it was already uploaded, else a new one from `send`"
+        with open_image(image, self.paths) as data:
+            key = self.key(data, max_side, quality)
+            image_id = self.get(key)
+            return image_id if image_id is not None else self._flights.do(key, lambda: self._upload(key, data, send, max_side, quality))
+
+    async def aupload(self, image: ImageSource, send: Callable, max_side: int = 1024, quality: int = 85):
+        "`image_id` of `image`, awaiting `send`. See `ImageIds.upload`"
+        with open_image(image, self.paths) as data:
+            # Hashing and re-encoding take a while on large images, keep them off the event loop
+            key = await asyncio.to_thread(self.key, data, max_side, quality)
+            image_id = await offload(self.backend, self.get, key)
+            if image_id is not None: return image_id
+            async def upload():
+                image_id = await offload(self.backend, self.get, key)
+                if image_id is None:
+                    image_id = await send(*await asyncio.to_thread(self._prepare, data, max_side, quality))
+                    await offload(self.backend, self.backend.set, key, image_id.encode(), self.ttl)
+                return image_id
+            return await self._flights.ado(key, upload)
@@ -0,0 +1,109 @@
+"""Local index of the products seen, to answer refinements of a search without calling the API"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/12_index.ipynb.
+
+# %% auto 0
+__all__ = ['sort_by_price', 'ProductIndex']
+
+# %% ../nbs/12_index.ipynb 3
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Tuple
+from .models import Product
+
+# %% ../nbs/12_index.ipynb 5
+def _tokens(*texts) -> set:
+    "Lowercase words of `texts`"
+    return {t for s in texts if s for t in re.findall(r'\w+', str(s).lower())}
+
+def _query_key(query: str) -> str: return ' '.join(sorted(_tokens(query)))
+
+def _price(p: Product) -> float:
+    try: return float(p.price)
+    except (TypeError, ValueError): return math.nan
+
+def sort_by_price(products: List[Product], order: str = None) -> List[Product]:
+    "`products` sorted by price, descending if `order` is `desc`, those without a price last"
+    sign = -1 if order == 'desc' else 1
+    return sorted(products, key=lambda p: (math.isnan(_price(p)), sign * _price(p)))
+
+def _contains(outer: Tuple, price_min: float, price_max: float) -> bool:
+    "Whether the price range `outer` of a search, `None` if it had none, contains `[price_min, price_max]`"
+    if outer is None: return True
+    lo, hi = outer
+    return lo <= price_min and price_max is not None and price_max <= hi
+
+
+class ProductIndex:
+    "Products seen in search and product-detail responses, searchable without calling the API"
+    def __init__(self,
+                 maxsize: int = 10_000, # Maximum number of products kept
+                 ttl: float = 900): # Seconds a search answers refinements of its query
+        self.maxsize, self.ttl = maxsize, ttl
+        self._products = OrderedDict() # id -> (Product, words of its name, brand and merchant)
+        self._slugs, self._searches = {}, {} # slug -> id, query key -> {price range: (ids, time, next page, complete)}
+        self._lock = threading.Lock()
+
+    def _put(self, p: Product):
+        old = self._products.pop(p.id, None)
+        if old is not None: self._slugs.pop(old[0].slug, None)
+        self._products[p.id] = (p, _tokens(p.name, p.brand, p.store_name))
+        if p.slug: self._slugs[p.slug] = p.id
+        while len(self._products) > self.maxsize: self._slugs.pop(self._products.popitem(last=False)[1][0].slug, None)
+
+    def add(self,
+            products: List[Product], # Products of a response
+            query: str = None, # Query of the search that returned them, `None` for product details
+            price_range: Tuple[float, float] = None, # Price range the search was filtered by, if any
+            page: int = 1, # Page of the search results
+            last: bool = False): # Whether this is the last page, so the search returned all its results
+        "Index `products`, and record them as results of the search for `query`"
+        products = [p for p in products if p.id is not None]
+        now = time.time()
+        with self._lock:
+            for p in products: self._put(p)
+            if query is None: return
+            searches = self._searches.setdefault(_query_key(query), {})
+            key = tuple(price_range) if price_range is not None else None
+            ids, t, nxt, _ = searches.get(key, ((), 0, 1, False))
+            if t + self.ttl < now or page == 1: ids, nxt = (), 1
+            # Later pages of a search extend its results, in rank order. After a missing page, it can't be complete
+            nxt = page + 1 if nxt == page else None
+            searches[key] = (tuple(dict.fromkeys(ids + tuple(p.id for p in products))), now, nxt, last and nxt is not None)
+            for k in [k for k, v in searches.items() if v[1] + self.ttl < now]: del searches[k]
+
+    def get(self, key: str) -> Product:
+        "Product with id or slug `key`, or `None`"
+        with self._lock:
+            item = self._products.get(self._slugs.get(key, key))
+            return item[0] if item else None
+
+    def search(self,
+               query: str, # Query of an earlier search
+               price_min: float = 0, # Minimum price
+               price_max: float = None, # Maximum price
+               keywords: str = None, # Words the product name, brand or merchant must all contain
+               sort: str = None, # `price` (or any value containing it) sorts by price, otherwise the search's order is kept
+               order: str = None, # `asc` or `desc`
+               limit: int = 20): # Maximum number of products returned
+        "Products of the earlier search for `query` that match the refinement, or `None` if no search covers it"
+        now, words = time.time(), _tokens(keywords)
+        with self._lock:
+            ids = next((ids for rng, (ids, t, _, complete) in self._searches.get(_query_key(query), {}).items()
+                        if complete and t + self.ttl >= now and _contains(rng, price_min, price_max)), None)
+            # A search is only as good as its products: once some of them are evicted, ask again
+            if ids is None or any(i not in self._products for i in ids): return None
+            items = [self._products[i] for i in ids]
+        # Products without a price only match when no price range is asked
+        filtered, hi = price_min > 0 or price_max is not None, math.inf if price_max is None else price_max
+        res = [p for p, toks in items if words <= toks and (not filtered or price_min <= _price(p) <= hi)]
+        if sort and 'price' in sort: res = sort_by_price(res, order)
+        return res[:limit]
+
+    def clear(self):
+        with self._lock: self._products.clear(); self._slugs.clear(); self._searches.clear()
+
+    def __len__(self): return len(self._products)
@@ -0,0 +1,157 @@
+"""Latency, throughput and error instrumentation for the Agora and Fewsats calls"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/05_metrics.ipynb.
+
+# %% auto 0
+__all__ = ['Span', 'default_buckets', 'Histogram', 'Metrics', 'Instrumentation', 'otel_span_hook']
+
+# %% ../nbs/05_metrics.ipynb 3
+import bisect
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Callable, List
+import httpx
+
+# %% ../nbs/05_metrics.ipynb 5
+class Span:
+    "Timing and attributes of one upstream call, in the spirit of an OpenTelemetry span"
+    __slots__ = ('name', 'attributes', 'start', 'end', 'error')
+    def __init__(self, name: str, **attributes):
+        self.name, self.attributes, self.error = name, attributes, None
+        self.start, self.end = time.perf_counter(), None
+
+    @property
+    def duration(self) -> float:
+        "Seconds between start and end"
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def __repr__(self): return f'Span({self.name!r}, {self.duration*1000:.1f}ms, {self.attributes})'
+
+# %% ../nbs/05_metrics.ipynb 6
+default_buckets = (.005, .01, .025, .05, .1, .25, .5, 1., 2.5, 5., 10., 30.)
+
+class Histogram:
+    "Cumulative-bucket latency histogram"
+    def __init__(self, buckets=default_buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1) # The last one is +Inf
+        self.sum, self.count = 0., 0
+
+    def observe(self, v: float):
+        self.counts[bisect.bisect_left(self.buckets, v)] += 1
+        self.sum += v
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        "Estimate of the `q` quantile, interpolated within its bucket"
+        if not self.count: return None
+        rank, seen = q * self.count, 0
+        for i, c in enumerate(self.counts):
+            if seen + c >= rank and c:
+                lo = self.buckets[i-1] if i else 0.
+                hi = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lo + (hi - lo) * (rank - seen) / c
+            seen += c
+        return self.buckets[-1]
+
+# %% ../nbs/05_metrics.ipynb 8
+def _labels(**kw): return '{' + ','.join(f'{k}="{v}"' for k, v in kw.items()) + '}'
+
+class Metrics:
+    "Per-endpoint latency histograms and counters for upstream calls"
+    def __init__(self, buckets=default_buckets):
+        self.latency = defaultdict(lambda: Histogram(buckets))
+        self.statuses, self.bytes_in, self.bytes_out = Counter(), Counter(), Counter()
+        self.retries, self.errors, self.cache = Counter(), Counter(), Counter()
+        self._lock = threading.Lock()
+
+    def record(self, span: Span):
+        "Account for a finished span"
+        a = span.attributes
+        ep = a.get('endpoint', span.name)
+        with self._lock:
+            self.latency[ep].observe(span.duration)
+            self.statuses[ep, a.get('status', 'error')] += 1
+            self.bytes_in[ep] += a.get('bytes_in', 0)
+            self.bytes_out[ep] += a.get('bytes_out', 0)
+            if a.get('attempt', 1) > 1: self.retries[ep] += 1
+            if span.error is not None: self.errors[ep, type(span.error).__name__] += 1
+
+    def record_cache(self, endpoint: str, hit: bool):
+        with self._lock: self.cache[endpoint, 'hit' if hit else 'miss'] += 1
+
+    def snapshot(self) -> dict:
+        "Current metrics per endpoint, with latency percentiles in ms"
+        with self._lock:
+            res = defaultdict(dict)
+            for ep, h in self.latency.items():
+                res[ep].update(requests=h.count, p50_ms=_ms(h.quantile(.5)), p99_ms=_ms(h.quantile(.99)),
+                               mean_ms=_ms(h.sum / h.count), bytes_in=self.bytes_in[ep], bytes_out=self.bytes_out[ep],
+                               retries=self.retries[ep])
+            for (ep, status), n in self.statuses.items(): res[ep].setdefault('statuses', {})[str(status)] = n
+            for (ep, err), n in self.errors.items(): res[ep].setdefault('errors', {})[err] = n
+            for (ep, kind), n in self.cache.items(): res[ep].setdefault('cache', {})[kind] = n
+        return dict(res)
+
+    def to_prometheus(self, prefix: str = 'agora') -> str:
+        "Metrics in the Prometheus text exposition format"
+        out = [f'# HELP {prefix}_request_duration_seconds Latency of upstream requests',
+               f'# TYPE {prefix}_request_duration_seconds histogram']
+        with self._lock:
+            for ep, h in sorted(self.latency.items()):
+                acc = 0
+                for le, c in zip([*h.buckets, '+Inf'], h.counts):
+                    acc += c
+                    out.append(f'{prefix}_request_duration_seconds_bucket{_labels(endpoint=ep, le=le)} {acc}')
+                out.append(f'{prefix}_request_duration_seconds_sum{_labels(endpoint=ep)} {h.sum}')
+                out.append(f'{prefix}_request_duration_seconds_count{_labels(endpoint=ep)} {h.count}')
+            counters = [('requests_total', 'Upstream requests by status', self.statuses, ('endpoint', 'status')),
+                        ('errors_total', 'Upstream requests that raised', self.errors, ('endpoint', 'error')),
+                        ('retries_total', 'Retried upstream requests', self.retries, ('endpoint',)),
+                        ('received_bytes_total', 'Response bytes received', self.bytes_in, ('endpoint',)),
+                        ('sent_bytes_total', 'Request bytes sent', self.bytes_out, ('endpoint',)),
+                        ('cache_lookups_total', 'Response cache lookups', self.cache, ('endpoint', 'result'))]
+            for name, doc, counter, labels in counters:
+                out += [f'# HELP {prefix}_{name} {doc}', f'# TYPE {prefix}_{name} counter']
+                for k, n in sorted(counter.items(), key=str):
+                    k = k if isinstance(k, tuple) else (k,)
+                    out.append(f'{prefix}_{name}{_labels(**dict(zip(labels, k)))} {n}')
+        return '\n'.join(out) + '\n'
+
+
+def _ms(v): return None if v is None else round(v * 1000, 2)
+
+# %% ../nbs/05_metrics.ipynb 9
+class Instrumentation:
+    "Hands the spans of upstream calls to a `Metrics` collector and to span hooks"
+    def __init__(self,
+                 metrics: Metrics = None, # Collector for the spans, defaults to a new `Metrics()`
+                 span_hooks: List[Callable] = None): # Called with every finished `Span`
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.span_hooks = list(span_hooks or [])
+
+    def start(self, name: str, **attributes) -> Span: return Span(name, **attributes)
+
+    def end(self, span: Span, response: httpx.Response = None, error: Exception = None):
+        "Finish `span` with the outcome of the call and report it"
+        span.end, span.error = time.perf_counter(), error
+        if response is not None:
+            span.attributes.update(status=response.status_code, bytes_in=response.num_bytes_downloaded)
+        self.metrics.record(span)
+        for hook in self.span_hooks: hook(span)
+
+    def cache(self, endpoint: str, hit: bool): self.metrics.record_cache(endpoint, hit)
+
+# %% ../nbs/05_metrics.ipynb 11
+def otel_span_hook(tracer):
+    "Span hook that re-emits spans through an OpenTelemetry `tracer`"
+    def hook(span: Span):
+        # Spans are timed with `perf_counter`, OpenTelemetry wants epoch nanoseconds
+        end_ns = time.time_ns() - int((time.perf_counter() - span.end) * 1e9)
+        start_ns = end_ns - int(span.duration * 1e9)
+        otel = tracer.start_span(span.name, start_time=start_ns,
+                                 attributes={f'agora.{k}': v for k, v in span.attributes.items()})
+        if span.error is not None: otel.record_exception(span.error)
+        otel.end(end_time=end_ns)
+    return hook
@@ -0,0 +1,173 @@
+"""Lightweight typed results for the Agora API responses"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/02_models.ipynb.
+
+# %% auto 0
+__all__ = ['Result', 'Product', 'SearchResults', 'ProductDetail', 'Cart', 'Order', 'Tracking', 'Credentials', 'TokenRefresh']
+
+# %% ../nbs/02_models.ipynb 3
+from typing import List
+import httpx
+
+try: from orjson import loads as _loads
+except ImportError: from json import loads as _loads
+
+# %% ../nbs/02_models.ipynb 5
+_missing = object()
+
+class Result:
+    "Response wrapper that decodes the JSON body lazily, on first access"
+    __slots__ = ('_response', '_data')
+    def __init__(self, response: httpx.Response):
+        self._response, self._data = response, _missing
+
+    @property
+    def response(self) -> httpx.Response: return self._response
+    @property
+    def status_code(self) -> int: return self._response.status_code
+    @property
+    def is_success(self) -> bool: return self._response.is_success
+    @property
+    def content(self) -> bytes:
+        "Raw body, as received"
+        return self._response.content
+    @property
+    def text(self) -> str: return self._response.text
+
+    def json(self):
+        "Decoded body, parsed once and reused"
+        if self._data is _missing: self._data = _loads(self._response.content)
+        return self._data
+
+    @property
+    def data(self):
+        "Payload of the response, without the `{\"status\": ..., \"data\": ...}` envelope if there is one"
+        d = self.json()
+        return d['data'] if isinstance(d, dict) and isinstance(d.get('data'), (dict, list)) else d
+
+    def raise_for_status(self):
+        self._response.raise_for_status()
+        return self
+
+    # Anything else (`headers`, `url`, `elapsed`, ...) comes from the wrapped response
+    def __getattr__(self, k):
+        if k.startswith('_'): raise AttributeError(k)
+        return getattr(self._response, k)
+    def __repr__(self): return f'<{type(self).__name__} [{self.status_code}]>'
+
+# %% ../nbs/02_models.ipynb 6
+class Product:
+    "Compact product record"
+    __slots__ = ('id', 'slug', 'name', 'brand', 'store_name', 'price', 'url', 'images', 'source', 'score', 'rating',
+                 'discount', 'description', 'variants')
+    _keys = dict(id='_id', store_name='storeName', score='agoraScore', rating='averageRating', discount='discountVal')
+
+    def __init__(self, **kwargs):
+        for k in self.__slots__: setattr(self, k, kwargs.get(k))
+
+    @classmethod
+    def from_dict(cls, d: dict):
+        "Build a `Product` from an Agora product object, dropping the fields not kept"
+        return cls(**{k: d.get(cls._keys.get(k, k)) for k in cls.__slots__})
+
+    def to_dict(self) -> dict:
+        "The kept fields, with the Agora key names"
+        return {self._keys.get(k, k): getattr(self, k) for k in self.__slots__ if getattr(self, k) is not None}
+
+    def __eq__(self, o): return isinstance(o, Product) and self.to_dict() == o.to_dict()
+    def __hash__(self): return hash(self.id)
+    def __repr__(self): return f'Product(name={self.name!r}, price={self.price!r}, slug={self.slug!r})'
+
+# %% ../nbs/02_models.ipynb 8
+class SearchResults(Result):
+    "A page of search results"
+    __slots__ = ('_products',)
+    def __init__(self, response: httpx.Response):
+        super().__init__(response)
+        self._products = None
+
+    @property
+    def products(self) -> List[Product]:
+        "Products in the page, decoded on first access"
+        if self._products is None:
+            if not self.is_success: d = {}
+            elif self._data is not _missing: d = self._data
+            else: d = _loads(self._response.content) # Not kept: only `json()` holds on to the dict tree of the page
+            self._products = [Product.from_dict(o) for o in d.get('Products') or []]
+        return self._products
+
+    def __iter__(self): return iter(self.products)
+    def __len__(self): return len(self.products)
+    def __bool__(self): return True # an empty page is still a result, like the response it wraps
+    def __getitem__(self, i): return self.products[i]
+
+# %% ../nbs/02_models.ipynb 13
+class ProductDetail(Result):
+    "Detailed information about a product"
+    __slots__ = ('_product',)
+    def __init__(self, response: httpx.Response):
+        super().__init__(response)
+        self._product = None
+
+    @property
+    def product(self) -> Product:
+        "The product, decoded on first access"
+        if self._product is None and self.is_success:
+            d = self.data
+            self._product = Product.from_dict(d.get('product', d) if isinstance(d, dict) else {})
+        return self._product
+
+    @property
+    def variants(self) -> list:
+        "Variants of the product (ids, options and prices)"
+        return (self.product.variants if self.product else None) or []
+
+
+class Cart(Result):
+    "Cart creation or update response"
+    __slots__ = ()
+    @property
+    def items(self) -> list:
+        d = self.data
+        return (d.get('items') if isinstance(d, dict) else None) or []
+
+
+class Order(Result):
+    "Order creation response"
+    __slots__ = ()
+    @property
+    def order_id(self) -> str:
+        d = self.data
+        return (d.get('orderId') or d.get('_id')) if isinstance(d, dict) else None
+
+
+class Tracking(Result):
+    "Order tracking response"
+    __slots__ = ()
+    @property
+    def status(self) -> str:
+        "Current status of the order"
+        d = self.data
+        return (d.get('status') or d.get('orderStatus')) if isinstance(d, dict) else None
+
+# %% ../nbs/02_models.ipynb 14
+class Credentials:
+    "API key and refresh token returned by `Agora.refresh_token`"
+    __slots__ = ('api_key', 'refresh_token', 'expires_at')
+    def __init__(self, api_key: str = None, refresh_token: str = None, expires_at: str = None):
+        self.api_key, self.refresh_token, self.expires_at = api_key, refresh_token, expires_at
+    def __repr__(self): return f'Credentials(expires_at={self.expires_at!r})'
+
+
+class TokenRefresh(Result):
+    "Refresh token response"
+    __slots__ = ()
+    @property
+    def status(self) -> str: return self.json().get('status')
+    @property
+    def message(self) -> str: return self.json().get('message')
+
+    @property
+    def credentials(self) -> Credentials:
+        d = self.data
+        return Credentials(d.get('apiKey'), d.get('refreshToken'), d.get('expiresAt'))
@@ -0,0 +1,49 @@
+"""Reuse of created payment intents, so retried checkouts don't create duplicates"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/10_payments.ipynb.
+
+# %% auto 0
+__all__ = ['PaymentIntents']
+
+# %% ../nbs/10_payments.ipynb 3
+from typing import Callable, List
+import httpx
+from .cache import MemoryBackend, SingleFlight, _decode, _encode
+
+# %% ../nbs/10_payments.ipynb 5
+class PaymentIntents:
+    "Payment intents created recently, keyed by their offers"
+    def __init__(self,
+                 ttl: float = 600, # Seconds a created intent is returned again for the same offers
+                 maxsize: int = 1024, # Maximum number of intents remembered by the default `MemoryBackend`
+                 backend = None): # Storage with `get`/`set`/`clear`, e.g. `SQLiteBackend` to share it
+        self.ttl = ttl
+        self.backend = backend if backend is not None else MemoryBackend(maxsize)
+        self._flights = SingleFlight()
+
+    @staticmethod
+    def key(offers: List[dict]) -> str:
+        "Identity of a request for `offers`: the `(offer_id, amount, currency)` of each offer"
+        return 'payment:' + repr(tuple((str(o['offer_id']), o['amount'], o.get('currency', 'USD').upper()) for o in offers))
+
+    def get(self, key: str) -> httpx.Response:
+        "Intent created for `key` within the last `ttl` seconds, or `None`"
+        data = self.backend.get(key)
+        return _decode(data) if data is not None else None
+
+    def _create(self, key, offers, send):
+        r = self.get(key)
+        if r is not None: return r
+        r = send(offers)
+        if r.is_success: self.backend.set(key, _encode(r), self.ttl)
+        return r
+
+    def create(self,
+               offers: List[dict], # Fewsats offers
+               send: Callable): # `send(offers)` creates them upstream and returns the response
+        "Intent for `offers`: the one created earlier if there is one, else a new one from `send`"
+        key = self.key(offers)
+        r = self.get(key)
+        return r if r is not None else self._flights.do(key, lambda: self._create(key, offers, send))
+
+    def clear(self): self.backend.clear()
@@ -0,0 +1,105 @@
+"""Client-side token bucket rate limiting, optionally shared between processes"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/04_ratelimit.ipynb.
+
+# %% auto 0
+__all__ = ['MemoryBucketStore', 'SQLiteBucketStore', 'RateLimiter']
+
+# %% ../nbs/04_ratelimit.ipynb 3
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Dict, Tuple
+from .cache import offload
+
+# %% ../nbs/04_ratelimit.ipynb 5
+def _reserve(tokens: float, updated: float, now: float, n: float, rate: float, capacity: float):
+    "Refill a bucket up to `now` and take `n` tokens from it. Returns the new level and the seconds to wait"
+    tokens = min(capacity, tokens + (now - updated) * rate) - n
+    # A negative level is a queue of reservations that the refill pays back in order
+    return tokens, max(0., -tokens / rate)
+
+
+class MemoryBucketStore:
+    "Token buckets kept in this process"
+    blocking = False
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, name: str, n: float, rate: float, capacity: float) -> float:
+        "Take `n` tokens from bucket `name` and return the seconds to wait before using them"
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(name, (capacity, now))
+            tokens, wait = _reserve(tokens, updated, now, n, rate, capacity)
+            self._buckets[name] = (tokens, now)
+        return wait
+
+
+class SQLiteBucketStore:
+    "Token buckets kept in a SQLite file shared by every process that opens it"
+    blocking = True # Waits on the file lock while another process takes tokens
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL, updated REAL)')
+
+    def take(self, name: str, n: float, rate: float, capacity: float) -> float:
+        "Take `n` tokens from bucket `name` and return the seconds to wait before using them"
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so the read-modify-write is atomic across processes
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                now = time.time()
+                row = self._db.execute('SELECT tokens, updated FROM buckets WHERE name=?', (name,)).fetchone()
+                tokens, wait = _reserve(*(row or (capacity, now)), now, n, rate, capacity)
+                self._db.execute('INSERT OR REPLACE INTO buckets VALUES (?,?,?)', (name, tokens, now))
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+        return wait
+
+# %% ../nbs/04_ratelimit.ipynb 7
+class RateLimiter:
+    "Per-endpoint token buckets with blocking and async acquire"
+    def __init__(self,
+                 budgets: Dict[str, Tuple[float, float]], # `{endpoint: (rate, burst)}`, `'*'` applies to unlisted endpoints
+                 store = None): # Bucket storage, defaults to `MemoryBucketStore()`
+        self.budgets = budgets
+        self.store = store if store is not None else MemoryBucketStore()
+
+    def _wait(self, endpoint: str, n: float = 1) -> float:
+        budget = self.budgets.get(endpoint, self.budgets.get('*'))
+        if budget is None: return 0.
+        name = endpoint if endpoint in self.budgets else '*'
+        rate, burst = budget
+        return self.store.take(name, n, rate, burst)
+
+    def _take(self, endpoint, n, timeout):
+        "Seconds to wait for the turn of `endpoint`, or `None` if that's longer than `timeout`, in which case it is given back"
+        wait = self._wait(endpoint, n)
+        if timeout is None or wait <= timeout: return wait
+        self._wait(endpoint, -n)
+        return None
+
+    def acquire(self,
+                endpoint: str, # Endpoint about to be called
+                n: float = 1, # Tokens the call costs
+                timeout: float = None) -> bool: # Longest wait, unlimited if `None`
+        "Block until `endpoint` may be called. Returns `False` without waiting if that would take over `timeout` seconds"
+        wait = self._take(endpoint, n, timeout)
+        if wait: time.sleep(wait)
+        return wait is not None
+
+    async def aacquire(self, endpoint: str, n: float = 1, timeout: float = None) -> bool:
+        "Wait, without blocking the event loop, until `endpoint` may be called. See `RateLimiter.acquire`"
+        wait = await offload(self.store, self._take, endpoint, n, timeout)
+        if wait: await asyncio.sleep(wait)
+        return wait is not None
@@ -0,0 +1,134 @@
+"""Retry policy with backoff and per-endpoint circuit breakers"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/03_retry.ipynb.
+
+# %% auto 0
+__all__ = ['idempotent_methods', 'RetryPolicy', 'CircuitOpenError', 'CircuitBreaker', 'Breakers']
+
+# %% ../nbs/03_retry.ipynb 3
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict
+import httpx
+
+# %% ../nbs/03_retry.ipynb 5
+idempotent_methods = {'GET', 'HEAD', 'OPTIONS', 'DELETE'}
+
+# The request never reached the server, so it is safe to send it again whatever the method
+_unsent_errors = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+class RetryPolicy:
+    "Exponential backoff with jitter for transient failures"
+    def __init__(self,
+                 max_attempts: int = 3, # Total attempts, including the first one
+                 backoff: float = 0.5, # Delay before the first retry, doubled on each attempt
+                 max_backoff: float = 10., # Upper bound for the computed delay
+                 jitter: bool = True, # Pick a random delay between 0 and the computed one
+                 statuses = (429, 500, 502, 503, 504), # Response status codes worth retrying
+                 max_retry_after: float = 30.): # Longest `Retry-After` we are willing to wait
+        self.max_attempts, self.backoff, self.max_backoff, self.jitter = max_attempts, backoff, max_backoff, jitter
+        self.statuses, self.max_retry_after = set(statuses), max_retry_after
+
+    def retryable(self,
+                  request: httpx.Request,
+                  attempt: int, # Number of attempts already made
+                  response: httpx.Response = None,
+                  error: Exception = None) -> bool:
+        "Whether `request` should be sent again after `response` or `error`"
+        if attempt >= self.max_attempts: return False
+        if isinstance(error, _unsent_errors): return True
+        if request.method not in idempotent_methods and 'Idempotency-Key' not in request.headers: return False
+        if error is not None: return isinstance(error, httpx.TransportError)
+        return response.status_code in self.statuses
+
+    def delay(self,
+              attempt: int, # Number of attempts already made
+              response: httpx.Response = None) -> float:
+        "Seconds to wait before the next attempt"
+        retry_after = _retry_after(response) if response is not None else None
+        if retry_after is not None: return min(retry_after, self.max_retry_after)
+        d = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        return random.uniform(0, d) if self.jitter else d
+
+
+def _retry_after(r: httpx.Response) -> float:
+    "Seconds requested by the `Retry-After` header of `r`, if any"
+    v = r.headers.get('Retry-After')
+    if not v: return None
+    try: return max(0., float(v))
+    except ValueError: pass
+    try: return max(0., parsedate_to_datetime(v).timestamp() - time.time())
+    except (TypeError, ValueError): return None
+
+# %% ../nbs/03_retry.ipynb 8
+class CircuitOpenError(Exception):
+    "Raised instead of calling an endpoint whose circuit breaker is open"
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit open for '{endpoint}', retry in {retry_in:.1f}s")
+        self.endpoint, self.retry_in = endpoint, retry_in
+
+
+class CircuitBreaker:
+    "Fails fast once an endpoint keeps failing, probing it again after `reset_timeout`"
+    def __init__(self,
+                 failure_threshold: int = 5, # Consecutive failures that open the circuit
+                 reset_timeout: float = 30.): # Seconds to wait before probing an open circuit
+        self.failure_threshold, self.reset_timeout = failure_threshold, reset_timeout
+        self.state, self.failures, self.opened_at, self.probed_at = 'closed', 0, 0., 0.
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        "Whether a request may be sent now"
+        with self._lock:
+            if self.state == 'closed': return True
+            now = time.monotonic()
+            # The probe holds its lease for `reset_timeout`, after which another request may probe
+            waited = now - (self.opened_at if self.state == 'open' else self.probed_at)
+            if waited >= self.reset_timeout:
+                self.state, self.probed_at = 'half-open', now # Let this request through as the probe
+                return True
+            return False
+
+    def release(self):
+        "End a request that got no outcome: if it was the probe, the next request probes instead"
+        with self._lock:
+            if self.state == 'half-open': self.state = 'open' # `opened_at` is past, so the next `allow` probes
+
+    def retry_in(self) -> float:
+        "Seconds until the circuit will be probed again"
+        return max(0., self.opened_at + self.reset_timeout - time.monotonic())
+
+    def record(self, success: bool):
+        "Update the state with the outcome of a request"
+        with self._lock:
+            if success: self.state, self.failures = 'closed', 0
+            else:
+                self.failures += 1
+                if self.state == 'half-open' or self.failures >= self.failure_threshold:
+                    self.state, self.opened_at = 'open', time.monotonic()
+
+    def snapshot(self) -> dict:
+        return dict(state=self.state, failures=self.failures, retry_in=round(self.retry_in(), 3) if self.state == 'open' else 0.)
+
+
+class Breakers:
+    "One `CircuitBreaker` per endpoint, created on first use"
+    def __init__(self,
+                 failure_threshold: int = 5, # Consecutive failures that open a circuit
+                 reset_timeout: float = 30.): # Seconds to wait before probing an open circuit
+        self.failure_threshold, self.reset_timeout = failure_threshold, reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[endpoint]
+
+    def state(self) -> Dict[str, dict]:
+        "Snapshot of every breaker, for monitoring"
+        with self._lock: breakers = dict(self._breakers)
+        return {k: b.snapshot() for k, b in breakers.items()}
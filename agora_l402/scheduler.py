@@ -0,0 +1,110 @@
+"""Priority classes for checkout and browsing traffic, with their own concurrency limits and load shedding"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/17_scheduler.ipynb.
+
+# %% auto 0
+__all__ = ['OverloadedError', 'PriorityClass', 'default_classes', 'default_endpoints', 'Scheduler']
+
+# %% ../nbs/17_scheduler.ipynb 3
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict
+from .deadline import bounded, check
+
+# %% ../nbs/17_scheduler.ipynb 5
+class OverloadedError(Exception):
+    "Raised instead of sending a request of a class that is being shed"
+    def __init__(self, cls: str, endpoint: str, reason: str):
+        super().__init__(f"'{endpoint}' ({cls} traffic) shed: {reason}")
+        self.cls, self.endpoint = cls, endpoint
+
+
+class PriorityClass:
+    "Concurrency limit and shedding policy of a class of requests"
+    def __init__(self,
+                 limit: int, # Maximum number of requests of the class in flight
+                 max_queue: int = None, # Shed once this many requests are waiting, if `shed`
+                 max_wait: float = None, # Shed a request that waited this many seconds, if `shed`
+                 shed: bool = False): # Shed this class first when any class is under pressure
+        self.limit, self.max_queue, self.max_wait, self.shed = limit, max_queue, max_wait, shed
+        self.active = self.waiting = self.shed_count = 0
+
+    @property
+    def stats(self) -> dict: return dict(active=self.active, waiting=self.waiting, shed=self.shed_count)
+
+
+default_classes = lambda: {'checkout': PriorityClass(20), 'browse': PriorityClass(60, max_queue=100, max_wait=5., shed=True)}
+default_endpoints = {'order': 'checkout', 'cart': 'checkout', 'refresh-token': 'checkout'}
+
+
+class Scheduler:
+    "Admits requests by priority class, each class with its own concurrency limit"
+    def __init__(self,
+                 classes: Dict[str, PriorityClass] = None, # Classes by name, defaults to `checkout` (20) and a shed `browse` (60)
+                 endpoints: Dict[str, str] = None, # Class of each endpoint, merged over `default_endpoints`
+                 default: str = 'browse'): # Class of the endpoints not listed
+        self.classes = classes if classes is not None else default_classes()
+        self.endpoints, self.default = {**default_endpoints, **(endpoints or {})}, default
+        self._cond, self._acond = threading.Condition(), None
+
+    def class_of(self, endpoint: str) -> str: return self.endpoints.get(endpoint, self.default)
+
+    def _refuse(self, name: str, c: PriorityClass) -> str:
+        "Why a new request of class `c` is shed now, or `None` to let it queue"
+        if not c.shed: return None
+        if any(o.waiting for n, o in self.classes.items() if n != name): return 'other traffic is waiting'
+        if c.active < c.limit: return None
+        if c.max_queue is not None and c.waiting >= c.max_queue: return f'{c.waiting} requests waiting'
+        return None
+
+    def _shed(self, name, c, endpoint, reason):
+        c.shed_count += 1
+        return OverloadedError(name, endpoint, reason)
+
+    @contextmanager
+    def slot(self, endpoint: str):
+        "Hold a slot of the class of `endpoint` while sending a request"
+        name = self.class_of(endpoint)
+        c = self.classes[name]
+        with self._cond:
+            reason = self._refuse(name, c)
+            if reason: raise self._shed(name, c, endpoint, reason)
+            c.waiting += 1
+            # Waiting past the caller's deadline is pointless, whatever the class
+            try: ok = self._cond.wait_for(lambda: c.active < c.limit, timeout=bounded(c.max_wait if c.shed else None))
+            finally: c.waiting -= 1
+            if not ok:
+                check(endpoint)
+                raise self._shed(name, c, endpoint, f'waited {c.max_wait}s')
+            c.active += 1
+        try: yield
+        finally:
+            with self._cond:
+                c.active -= 1
+                self._cond.notify_all()
+
+    @asynccontextmanager
+    async def aslot(self, endpoint: str):
+        "Hold a slot of the class of `endpoint` while sending a request, waiting without blocking the event loop"
+        if self._acond is None: self._acond = asyncio.Condition()
+        name = self.class_of(endpoint)
+        c = self.classes[name]
+        async with self._acond:
+            reason = self._refuse(name, c)
+            if reason: raise self._shed(name, c, endpoint, reason)
+            c.waiting += 1
+            try: await asyncio.wait_for(self._acond.wait_for(lambda: c.active < c.limit), bounded(c.max_wait if c.shed else None))
+            except asyncio.TimeoutError:
+                check(endpoint)
+                raise self._shed(name, c, endpoint, f'waited {c.max_wait}s') from None
+            finally: c.waiting -= 1
+            c.active += 1
+        try: yield
+        finally:
+            async with self._acond:
+                c.active -= 1
+                self._acond.notify_all()
+
+    @property
+    def stats(self) -> dict: return {n: c.stats for n, c in self.classes.items()}
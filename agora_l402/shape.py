@@ -0,0 +1,114 @@
+"""Compact, token-budgeted views of the Agora responses for LLM tools"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/06_shape.ipynb.
+
+# %% auto 0
+__all__ = ['iter_items', 'default_fields', 'Shaper']
+
+# %% ../nbs/06_shape.ipynb 3
+import json
+import re
+from typing import Iterable
+from .utils import patch
+from .models import Result, SearchResults, ProductDetail, Product
+
+# %% ../nbs/06_shape.ipynb 5
+_ws = re.compile(r'[ \t\n\r]*')
+_scan = json.JSONDecoder().scan_once
+
+def iter_items(body, # JSON object, as `bytes` or `str`
+               key: str # Top-level key of the array to iterate
+              ) -> Iterable:
+    "Decode the items of the array under `key` one at a time, leaving the rest of `body` undecoded"
+    s = body.decode() if isinstance(body, (bytes, bytearray)) else body
+    skip = lambda i: _ws.match(s, i).end()
+    try:
+        i = skip(0)
+        if s[i:i+1] != '{': return
+        i = skip(i + 1)
+        while s[i:i+1] == '"':
+            k, i = _scan(s, i)
+            i = skip(skip(i) + 1) # past the ':'
+            if k == key and s[i:i+1] == '[':
+                i = skip(i + 1)
+                while s[i:i+1] not in (']', ''):
+                    item, i = _scan(s, i)
+                    yield item
+                    i = skip(i)
+                    if s[i:i+1] == ',': i = skip(i + 1)
+                return
+            _, i = _scan(s, i) # Other top-level values are small (`count`, `page`, ...)
+            i = skip(i)
+            if s[i:i+1] == ',': i = skip(i + 1)
+    except StopIteration as e: raise ValueError(f'Invalid JSON at position {e.value}') from None
+
+# %% ../nbs/06_shape.ipynb 7
+default_fields = ('_id', 'slug', 'name', 'brand', 'storeName', 'price', 'url', 'images', 'averageRating', 'discountVal',
+                  'description', 'variants')
+
+def _size(o) -> int: return len(json.dumps(o, separators=(',', ':'), ensure_ascii=False).encode())
+
+_product_keys = {Product._keys.get(k, k) for k in Product.__slots__} # Fields a `Product` keeps, with the Agora key names
+
+class Shaper:
+    "Projects Agora responses to compact payloads that fit a byte or token budget"
+    def __init__(self,
+                 fields: Iterable[str] = default_fields, # Product fields kept, with the Agora key names
+                 max_description: int = 200, # Characters kept of a description
+                 max_images: int = 1, # Image URLs kept per product
+                 max_variants: int = 20, # Variants kept of a product detail
+                 max_items: int = None, # Products kept of a search page
+                 max_bytes: int = None, # Budget for the products of a search page, in bytes of compact JSON
+                 max_tokens: int = 4000): # Same budget in LLM tokens, at ~4 bytes per token
+        self.fields, self.max_description, self.max_images = tuple(fields), max_description, max_images
+        self.max_variants, self.max_items = max_variants, max_items
+        budgets = [b for b in (max_bytes, max_tokens and max_tokens * 4) if b]
+        self.max_bytes = min(budgets) if budgets else None
+
+    def product(self, d: dict) -> dict:
+        "The whitelisted fields of product `d`, with long values cut"
+        res = {k: d[k] for k in self.fields if d.get(k) is not None}
+        desc = res.get('description')
+        if isinstance(desc, str) and len(desc) > self.max_description:
+            res['description'] = desc[:self.max_description].rstrip() + '…'
+        if isinstance(res.get('images'), list): res['images'] = res['images'][:self.max_images]
+        if isinstance(res.get('variants'), list): res['variants'] = res['variants'][:self.max_variants]
+        return res
+
+    def products(self, items: Iterable[dict], max_bytes: int = None) -> dict:
+        "Shape `items` until `max_items` or the byte budget is reached"
+        budget = max_bytes or self.max_bytes
+        out, used, truncated = [], 0, False
+        for d in items:
+            if self.max_items is not None and len(out) >= self.max_items: truncated = True; break
+            p = self.product(d)
+            n = _size(p) + 1
+            if budget is not None and out and used + n > budget: truncated = True; break
+            out.append(p)
+            used += n
+        return dict(products=out, returned=len(out), truncated=truncated)
+
+# %% ../nbs/06_shape.ipynb 10
+@patch
+def __call__(self: Shaper,
+             r, # Client result, exception or dict of them
+             max_bytes: int = None): # Overrides the shaper's byte budget
+    "Compact, JSON-serializable view of the client result `r`"
+    budget = max_bytes or self.max_bytes
+    if isinstance(r, dict):
+        if not any(isinstance(v, Exception) or hasattr(v, 'status_code') for v in r.values()): return r
+        per = budget // max(len(r), 1) if budget else None
+        return {k: self(v, per) for k, v in r.items()}
+    if isinstance(r, Exception): return {'error': f'{type(r).__name__}: {r}'}
+    if not hasattr(r, 'status_code'): return r
+    if not r.is_success: return {'status_code': r.status_code, 'error': r.text[:500]}
+    if isinstance(r, SearchResults):
+        # Products already decoded by the caller are reused, otherwise the body is parsed only as far as needed
+        if r._products is not None and _product_keys.issuperset(self.fields): items = (p.to_dict() for p in r._products)
+        elif r._products is not None: items = r.json().get('Products') or [] # Fields a `Product` doesn't keep
+        else: items = iter_items(r.content, 'Products')
+        return self.products(items, budget)
+    if isinstance(r, ProductDetail):
+        d = r.data
+        return self.product(d.get('product', d) if isinstance(d, dict) else {})
+    return r.data if isinstance(r, Result) else r.json()
@@ -0,0 +1,54 @@
+"""Register the client methods as MCP tools"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/07_tools.ipynb.
+
+# %% auto 0
+__all__ = ['as_tool', 'register_tools']
+
+# %% ../nbs/07_tools.ipynb 3
+import asyncio
+import inspect
+import json
+from typing import Callable, List, Optional
+from .core import Agora
+from .deadline import deadline
+
+# %% ../nbs/07_tools.ipynb 5
+_deadline_doc = "deadline (float, optional): Seconds to answer within, the call fails early if it can't"
+
+def _signature(f: Callable, seconds: float = None) -> inspect.Signature:
+    "Signature of the tool for client method `f`: `None` defaults become optional types, a `deadline` is added and the result is a string"
+    params = [p.replace(annotation=Optional[p.annotation])
+              if p.default is None and p.annotation is not p.empty else p
+              for p in inspect.signature(f).parameters.values()]
+    params.append(inspect.Parameter('deadline', inspect.Parameter.KEYWORD_ONLY, default=seconds, annotation=Optional[float]))
+    return inspect.Signature(params, return_annotation=str)
+
+def as_tool(f: Callable, # Bound method of an `Agora` or `AsyncAgora` client
+            result: Callable = json.dumps, # Turns the method's return value into the tool output
+            seconds: float = None # Default `deadline` of a call, unlimited if `None`
+           ) -> Callable:
+    "Async tool function calling the client method `f`, within the `deadline` passed to it"
+    name = f.__name__
+    is_async = inspect.iscoroutinefunction(f)
+    async def tool(**kwargs):
+        # The client enforces the deadline request by request, so the writes it has sent aren't cut short.
+        # A `null` deadline in the call gets the server's default, like a missing one.
+        d = kwargs.pop('deadline', None)
+        with deadline(seconds if d is None else d):
+            # Sync clients run in a thread, to keep the server's event loop free. The thread sees the deadline too.
+            return result(await (f(**kwargs) if is_async else asyncio.to_thread(f, **kwargs)))
+    tool.__name__ = tool.__qualname__ = name
+    # The async methods only point back to the sync ones, which carry the full docs
+    tool.__doc__ = (inspect.getdoc(getattr(Agora, name, f)) or f'{name} function') + f"\n\n{_deadline_doc}"
+    tool.__signature__ = _signature(f, seconds)
+    return tool
+
+def register_tools(server, # FastMCP server, or anything with an `add_tool(fn)` method
+                   agora, # `Agora` or `AsyncAgora` client the tools call
+                   tools: List[Callable] = None, # Client methods to expose, defaults to `agora.as_tools()` and `agora.stats`
+                   result: Callable = json.dumps, # Turns a method's return value into the tool output
+                   deadline: float = None): # Seconds a call gets when the agent passes no `deadline`, unlimited if `None`
+    "Add the client methods `tools` to `server` as tools"
+    for f in (tools if tools is not None else agora.as_tools() + [agora.stats]): server.add_tool(as_tool(f, result, deadline))
+    return server
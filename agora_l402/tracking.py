@@ -0,0 +1,123 @@
+"""Watch many orders at once and report only their status changes"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/13_tracking.ipynb.
+
+# %% auto 0
+__all__ = ['final_statuses', 'OrderWatcher']
+
+# %% ../nbs/13_tracking.ipynb 3
+import asyncio
+import inspect
+import threading
+import time
+from typing import Callable, List
+from .ratelimit import RateLimiter
+
+# %% ../nbs/13_tracking.ipynb 5
+final_statuses = ('delivered', 'cancelled', 'canceled', 'refunded', 'returned', 'failed')
+
+class _Order:
+    __slots__ = ('status', 'interval', 'due')
+    def __init__(self, interval): self.status, self.interval, self.due = None, interval, 0.
+
+
+class OrderWatcher:
+    "Polls the tracking of many orders, less often the longer they stay unchanged, and queues their status changes"
+    def __init__(self,
+                 track: Callable, # `track(order_id)` returns a `Tracking`, e.g. `agora.track_order` (sync or async)
+                 min_interval: float = 15, # Seconds between polls of an order that just changed
+                 max_interval: float = 600, # Longest interval between polls of an unchanged order
+                 backoff: float = 2, # Factor applied to the interval after each unchanged poll
+                 concurrency: int = 8, # Maximum number of requests in flight
+                 rate: float = None, # Maximum requests per second, unlimited if `None`
+                 final: tuple = final_statuses): # Statuses after which an order is no longer polled
+        self.track, self.final = track, {s.lower() for s in final}
+        self.min_interval, self.max_interval, self.backoff, self.concurrency = min_interval, max_interval, backoff, concurrency
+        self._limiter = RateLimiter({'*': (rate, max(rate, 1))}) if rate else None
+        self._orders, self._changes = {}, {}
+        self._lock = threading.Lock()
+
+    def watch(self, order_ids: List[str]):
+        "Start polling `order_ids`, the ones already watched keep their state"
+        with self._lock:
+            for i in order_ids: self._orders.setdefault(i, _Order(self.min_interval))
+
+    def unwatch(self, order_ids: List[str]):
+        "Stop polling `order_ids` and drop their queued changes"
+        with self._lock:
+            for i in order_ids: self._orders.pop(i, None); self._changes.pop(i, None)
+
+    @property
+    def watching(self) -> List[str]: return list(self._orders)
+
+    def due_in(self) -> float:
+        "Seconds until the next order is due, `None` if no order is watched"
+        with self._lock: due = min((o.due for o in self._orders.values()), default=None)
+        return None if due is None else max(0., due - time.monotonic())
+
+    async def _track(self, order_id, sem):
+        async with sem:
+            if self._limiter is not None: await self._limiter.aacquire('*')
+            try:
+                r = await self.track(order_id) if inspect.iscoroutinefunction(self.track) else await asyncio.to_thread(self.track, order_id)
+            except Exception: return None
+            return r if r.is_success else None
+
+    def _update(self, order_id, r, now):
+        "Record the answer `r` for `order_id`, queueing a change if its status changed"
+        o = self._orders.get(order_id)
+        if o is None: return # unwatched meanwhile
+        status = r.status if r is not None else None
+        if r is None or status == o.status:
+            # Failures back off like unchanged answers, so an unreachable API isn't hammered
+            o.interval = min(o.interval * self.backoff, self.max_interval)
+        else:
+            prev = self._changes.get(order_id, {}).get('previous', o.status)
+            self._changes[order_id] = dict(order_id=order_id, status=status, previous=prev, tracking=r.data)
+            if status == prev: del self._changes[order_id] # changed back before anyone looked
+            o.status, o.interval = status, self.min_interval
+            if str(status).lower() in self.final: del self._orders[order_id]
+        o.due = now + o.interval
+
+    async def poll(self) -> int:
+        "Track the orders that are due, concurrently, and return how many were polled"
+        now = time.monotonic()
+        with self._lock:
+            due = [i for i, o in self._orders.items() if o.due <= now]
+            # Claimed before awaiting, so a concurrent `poll` doesn't track the same orders again
+            for i in due: self._orders[i].due = now + self._orders[i].interval
+        if not due: return 0
+        sem = asyncio.Semaphore(self.concurrency)
+        res = await asyncio.gather(*[self._track(i, sem) for i in due])
+        now = time.monotonic()
+        with self._lock:
+            for i, r in zip(due, res): self._update(i, r, now)
+        return len(due)
+
+    def take(self, order_ids: List[str] = None) -> List[dict]:
+        "Queued changes of `order_ids` (all if `None`), removed from the queue"
+        with self._lock:
+            ids = list(self._changes) if order_ids is None else [i for i in order_ids if i in self._changes]
+            return [self._changes.pop(i) for i in ids]
+
+    async def changes(self):
+        "Status changes of the watched orders, as they are seen, until no order is left to watch"
+        while True:
+            await self.poll()
+            for c in self.take(): yield c
+            wait = self.due_in()
+            if wait is None: return
+            await asyncio.sleep(wait)
+
+    async def wait(self,
+                   order_ids: List[str], # Orders to watch, added to the watched ones
+                   timeout: float = 60): # Seconds to wait for a change
+        "Watch `order_ids` and return their queued changes, waiting up to `timeout` seconds for one"
+        self.watch(order_ids)
+        deadline = time.monotonic() + timeout
+        while True:
+            await self.poll()
+            changes = self.take(order_ids)
+            left, wait = deadline - time.monotonic(), self.due_in()
+            if changes or left <= 0 or wait is None: return changes
+            await asyncio.sleep(min(wait, left))
@@ -0,0 +1,23 @@
+"""Small helpers shared by the modules, kept free of heavy imports"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/08_utils.ipynb.
+
+# %% auto 0
+__all__ = ['patch']
+
+# %% ../nbs/08_utils.ipynb 3
+from functools import partial
+from types import FunctionType
+
+# %% ../nbs/08_utils.ipynb 5
+def patch(f=None, *, as_prop: bool = False):
+    "Add `f` to the class(es) its first parameter is annotated with, as a property if `as_prop`"
+    if f is None: return partial(patch, as_prop=as_prop)
+    cls = f.__annotations__[f.__code__.co_varnames[0]]
+    for c in (cls if isinstance(cls, tuple) else (cls,)):
+        nf = FunctionType(f.__code__, f.__globals__, f.__name__, f.__defaults__, f.__closure__)
+        nf.__dict__.update(f.__dict__)
+        nf.__kwdefaults__, nf.__doc__, nf.__annotations__ = f.__kwdefaults__, f.__doc__, f.__annotations__
+        nf.__module__, nf.__qualname__ = f.__module__, f'{c.__name__}.{f.__name__}'
+        setattr(c, f.__name__, property(nf) if as_prop else nf)
+    return f
@@ -0,0 +1,119 @@
+"""Local stand-in for the Agora and Fewsats APIs, for offline benchmarks.
+
+    python benchmarks/mockserver.py --port 8402 --latency 20 --error-rate 0.01
+
+Agora endpoints are served under `/api/v1` and Fewsats offers under `/v0/l402/offers`.
+Responses are generated deterministically from the request parameters and shaped like the
+real ones (250-item search pages carry full product objects with images and price history).
+"""
+import argparse, hashlib, json, random, re, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+def product(i, q='item'):
+    "A product object shaped like the ones returned by the Agora search"
+    h = hashlib.md5(f'{q}-{i}'.encode()).hexdigest()
+    return {'name': f'{q.title()} {i}', 'storeName': f'Store {int(h[:2], 16) % 40}', 'brand': f'Brand {int(h[2:4], 16) % 25}',
+            '_id': h[:24], 'slug': f'{q.replace(" ", "-")}-{h}', 'price': 5 + int(h[4:8], 16) % 500,
+            'isVerified': False, 'isBoosted': False, 'source': 'shopify',
+            'images': [f'https://cdn.shopify.com/s/files/1/{h[:4]}/products/{h}-{k}.jpg?v=1677108275' for k in range(4)],
+            'url': f'https://store.example.com/products/{h}', 'agoraScore': int(h[8:10], 16) % 100,
+            'priceHistory': [{'price': 5 + int(h[4:8], 16) % 500, 'date': '2025-01-08T03:48:41.347Z', '_id': h[8:32]}],
+            'averageRating': round(int(h[10:12], 16) / 64, 1), 'discountVal': 0,
+            'description': ' '.join(['Lorem ipsum dolor sit amet, consectetur adipiscing elit.'] * 8)}
+
+def detail(slug):
+    p = product(0, slug.rsplit('-', 1)[0].replace('-', ' '))
+    p.update(slug=slug, variants=[{'variantId': 2061038485517 + k, 'title': f'Size {k + 6}', 'price': p['price'],
+                                   'available': True} for k in range(6)])
+    return {'status': 'success', 'data': p}
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive, so client connection pools are exercised
+    # Headers and body go out in separate writes: with Nagle on, the body waits for the client's delayed ACK (~40ms)
+    disable_nagle_algorithm = True
+    def log_message(self, *args): pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method):
+        cfg = self.server.cfg
+        url = urlparse(self.path)
+        qs = {k: v[0] for k, v in parse_qs(url.query).items()}
+        n = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(n) or b'{}') if n else {}
+        if cfg.latency: time.sleep(max(0., random.gauss(cfg.latency, cfg.latency * cfg.jitter)) / 1000)
+        if cfg.error_rate and random.random() < cfg.error_rate:
+            return self._reply(503, {'status': 'error', 'message': 'injected failure'})
+        path = url.path
+        if method == 'GET' and path in ('/api/v1/search', '/api/v1/search/trial'):
+            q, count, page = qs.get('q', 'item'), min(int(qs.get('count', 20)), 250), int(qs.get('page', 1))
+            start = (page - 1) * count
+            items = [product(i, q) for i in range(start, min(start + count, cfg.results))]
+            return self._reply(200, {'Products': items, 'count': len(items), 'page': page})
+        if method == 'GET' and path == '/api/v1/product-detail': return self._reply(200, detail(qs.get('slug', 'item-0')))
+        if path == '/api/v1/cart' and method in ('POST', 'PUT'):
+            items = body.get('items') or ([body['product']] if 'product' in body else [])
+            return self._reply(200, {'status': 'success', 'data': {'items': items}})
+        if method == 'POST' and path == '/api/v1/order':
+            oid = hashlib.md5(json.dumps(body, sort_keys=True).encode()).hexdigest()[:24]
+            return self._reply(200, {'status': 'success', 'data': {'orderId': oid}})
+        m = re.fullmatch(r'/api/v1/order-tracking/(\w+)', path)
+        if method == 'GET' and m:
+            return self._reply(200, {'status': 'success', 'data': {'_id': m.group(1), 'status': 'processing'}})
+        if method == 'POST' and path == '/api/v1/refresh-token':
+            return self._reply(200, {'status': 'success', 'data': {'apiKey': 'mock-key', 'refreshToken': 'mock-refresh',
+                                                                  'expiresAt': '2099-01-01T00:00:00.000Z'}})
+        if method == 'POST' and path == '/v0/l402/offers':
+            return self._reply(200, {'offers': body.get('offers', []), 'payment_context_token': 'mock-token',
+                                     'payment_request_url': f'http://{self.headers["Host"]}/v0/l402/payment-request',
+                                     'version': '0.2.2'})
+        self._reply(404, {'status': 'error', 'message': f'{method} {path} not found'})
+
+    def do_GET(self): self._handle('GET')
+    def do_POST(self): self._handle('POST')
+    def do_PUT(self): self._handle('PUT')
+
+class Server(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops connection bursts, and clients then wait out a 1s SYN retransmit
+    request_queue_size = 128
+
+class MockServer:
+    "Runs the stand-in server on a background thread"
+    def __init__(self, port=0, latency=0., jitter=0.2, error_rate=0., results=2000, seed=0):
+        random.seed(seed)
+        self.httpd = Server(('127.0.0.1', port), Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.cfg = argparse.Namespace(latency=latency, jitter=jitter, error_rate=error_rate, results=results)
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        self.agora_url = f'{self.url}/api/v1'
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self): self.httpd.shutdown()
+    def __enter__(self): return self.start()
+    def __exit__(self, *args): self.stop()
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--port', type=int, default=8402)
+    ap.add_argument('--latency', type=float, default=20., help='Mean added latency per request, in ms')
+    ap.add_argument('--jitter', type=float, default=.2, help='Latency standard deviation, as a fraction of the mean')
+    ap.add_argument('--error-rate', type=float, default=0., help='Fraction of requests answered with a 503')
+    ap.add_argument('--results', type=int, default=2000, help='Products matching any search')
+    ap.add_argument('--seed', type=int, default=0)
+    return ap.parse_args(argv)
+
+if __name__ == '__main__':
+    a = parse_args()
+    srv = MockServer(a.port, a.latency, a.jitter, a.error_rate, a.results, a.seed)
+    print(srv.url, flush=True)
+    srv.httpd.serve_forever()
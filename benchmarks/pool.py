@@ -0,0 +1,40 @@
+"""Compare p50/p99 latency of `search_trial` with and without the pooled connection.
+
+    python benchmarks/pool.py --n 50 --query shoes
+
+"cold" opens a fresh connection for every call (what `httpx.get` did before),
+"pooled" reuses the warm keep-alive connections of a single `Agora` client.
+"""
+import argparse, statistics, time
+import httpx
+from agora_l402.core import Agora, base_url
+
+def timed(f, n):
+    "Run `f` `n` times and return the latencies in ms"
+    res = []
+    for _ in range(n):
+        start = time.perf_counter()
+        f().raise_for_status()
+        res.append((time.perf_counter() - start) * 1000)
+    return res
+
+def report(name, lat):
+    lat = sorted(lat)
+    p99 = lat[min(len(lat) - 1, int(len(lat) * .99))]
+    print(f"{name:>8}: p50 {statistics.median(lat):7.1f} ms   p99 {p99:7.1f} ms   (n={len(lat)})")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--base-url', default=base_url)
+    ap.add_argument('--query', default='shoes')
+    ap.add_argument('--n', type=int, default=30)
+    ap.add_argument('--http2', action='store_true')
+    args = ap.parse_args()
+
+    cold = timed(lambda: httpx.get(f'{args.base_url}/search/trial', params={'q': args.query}, timeout=10), args.n)
+    with Agora(base_url=args.base_url, http2=args.http2) as agora:
+        agora.search_trial(args.query) # warm up the pool
+        pooled = timed(lambda: agora.search_trial(args.query), args.n)
+    report('cold', cold)
+    report('pooled', pooled)
+    print(f"p50 speedup: {statistics.median(cold) / statistics.median(pooled):.1f}x")
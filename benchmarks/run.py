@@ -0,0 +1,137 @@
+"""Offline benchmark of the Agora clients and the MCP tools against the local mock server.
+
+    python benchmarks/run.py                       # full run
+    python benchmarks/run.py --quick               # smoke run
+    python benchmarks/run.py --scenarios async mcp --concurrency 1 16 128 --latency 50
+
+For each scenario and concurrency level it prints throughput, p50/p99 latency, the error count
+and the peak RSS of the process. Nothing leaves the machine: the mock server runs in a
+subprocess on localhost, so results are repeatable in a sandbox without network.
+"""
+import argparse, asyncio, json, logging, random, resource, statistics, subprocess, sys, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+here = Path(__file__).parent
+sys.path.insert(0, str(here.parent))
+from agora_l402.core import Agora, AsyncAgora
+from fewsats.core import Fewsats
+
+def start_server(latency, error_rate):
+    "Start `mockserver.py` in a subprocess and return it with its base URL"
+    p = subprocess.Popen([sys.executable, str(here/'mockserver.py'), '--port', '0', '--latency', str(latency),
+                          '--error-rate', str(error_rate)], stdout=subprocess.PIPE, text=True)
+    return p, p.stdout.readline().strip()
+
+def workload(n, seed=0):
+    "A repeatable mix of `(method, args)` calls: mostly product details, some searches, tracking and payments"
+    rng, ops = random.Random(seed), []
+    for i in range(n):
+        r = rng.random()
+        if r < .6: ops.append(('get_product_detail', (f'shoe-{rng.randrange(5000)}',)))
+        elif r < .8: ops.append(('text_search', (rng.choice(['shoes', 'glasses', 'dress', 'bag']),), dict(count=250, page=rng.randrange(1, 8))))
+        elif r < .9: ops.append(('track_order', (f'{rng.randrange(16**24):024x}',)))
+        else: ops.append(('create_payment_intent', (f'offer-{i}', rng.randrange(100, 10000), 'Shoes', 'Running shoes', 'USD')))
+    return [o if len(o) == 3 else (*o, {}) for o in ops]
+
+
+def ok(r): return getattr(r, 'status_code', 200) < 500
+
+def mcp_ok(result):
+    "Like `ok`, for an MCP tool result: failed responses are shaped to `{\"status_code\": ..., \"error\": ...}`"
+    content = result[0] if isinstance(result, tuple) else result # newer FastMCP also returns structured output
+    try: body = json.loads(content[0].text)
+    except (IndexError, AttributeError, ValueError): return True
+    return not isinstance(body, dict) or body.get('status_code', 200) < 500
+
+def run_sync(url, ops, concurrency):
+    agora = Agora(api_key='bench', base_url=f'{url}/api/v1', fewsats=Fewsats(api_key='bench', base_url=url))
+    def call(op):
+        name, args, kw = op
+        start = time.perf_counter()
+        try: good = ok(getattr(agora, name)(*args, **kw))
+        except Exception: good = False
+        return time.perf_counter() - start, good
+    with ThreadPoolExecutor(concurrency) as ex: res = list(ex.map(call, ops))
+    agora.close()
+    return res
+
+async def run_async(url, ops, concurrency):
+    agora = AsyncAgora(api_key='bench', base_url=f'{url}/api/v1', fewsats=Fewsats(api_key='bench', base_url=url))
+    sem = asyncio.Semaphore(concurrency)
+    async def call(op):
+        name, args, kw = op
+        async with sem:
+            start = time.perf_counter()
+            try: good = ok(await getattr(agora, name)(*args, **kw))
+            except Exception: good = False
+            return time.perf_counter() - start, good
+    res = await asyncio.gather(*map(call, ops))
+    await agora.aclose()
+    return res
+
+def load_mcp(url):
+    "Import `mcp/main.py` with its client pointed at the mock server"
+    sys.path.insert(0, str(here.parent/'mcp'))
+    import main
+    logging.getLogger('httpx').setLevel(logging.WARNING) # FastMCP logs every request at INFO
+    main.agora.base_url = f'{url}/api/v1'
+    main.agora._fewsats = Fewsats(api_key='bench', base_url=url)
+    return main.mcp
+
+async def run_mcp(mcp, ops, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+    tools = {t.name: t for t in await mcp.list_tools()}
+    async def call(op):
+        name, args, kw = op
+        if name == 'text_search': name, kw = 'search_trial', {} # the only search the MCP server exposes
+        arguments = {**dict(zip(tools[name].inputSchema['properties'], args)), **kw}
+        async with sem:
+            start = time.perf_counter()
+            try: good = mcp_ok(await mcp.call_tool(name, arguments))
+            except Exception: good = False
+            return time.perf_counter() - start, good
+    return await asyncio.gather(*map(call, ops))
+
+def report(scenario, concurrency, res, elapsed):
+    lat = sorted(r[0] * 1000 for r in res)
+    p99 = lat[min(len(lat) - 1, int(len(lat) * .99))]
+    errors = sum(not r[1] for r in res)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # KiB on Linux
+    print(f'{scenario:>6} {concurrency:>5} {len(res)/elapsed:>10.1f} {statistics.median(lat):>9.1f} {p99:>9.1f} '
+          f'{errors:>7} {rss:>9.1f}', flush=True)
+
+async def bench(url, ops, scenarios, levels):
+    # One event loop for the whole run, since the MCP server's client is bound to the loop it first ran on
+    mcp = load_mcp(url) if 'mcp' in scenarios else None
+    for scenario in scenarios:
+        for c in levels:
+            start = time.perf_counter()
+            if scenario == 'sync': res = await asyncio.to_thread(run_sync, url, ops, c)
+            elif scenario == 'async': res = await run_async(url, ops, c)
+            else: res = await run_mcp(mcp, ops, c)
+            report(scenario, c, res, time.perf_counter() - start)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--scenarios', nargs='+', default=['sync', 'async', 'mcp'], choices=['sync', 'async', 'mcp'])
+    ap.add_argument('--concurrency', nargs='+', type=int, default=[1, 4, 16, 64])
+    ap.add_argument('--ops', type=int, default=400, help='Calls per scenario and concurrency level')
+    ap.add_argument('--latency', type=float, default=20., help='Mean server latency in ms')
+    ap.add_argument('--error-rate', type=float, default=0.)
+    ap.add_argument('--url', help='Use an already running mock server instead of starting one')
+    ap.add_argument('--quick', action='store_true', help='Small run, to check the harness works')
+    args = ap.parse_args(argv)
+    if args.quick: args.ops, args.concurrency = 40, [1, 8]
+
+    proc = None
+    url = args.url
+    if url is None: proc, url = start_server(args.latency, args.error_rate)
+    try:
+        ops = workload(args.ops)
+        print(f'{"":>6} {"conc":>5} {"ops/s":>10} {"p50 ms":>9} {"p99 ms":>9} {"errors":>7} {"rss MB":>9}')
+        asyncio.run(bench(url, ops, args.scenarios, args.concurrency))
+    finally:
+        if proc is not None: proc.terminate()
+
+if __name__ == '__main__': main()
@@ -1,204 +1,79 @@
-
-from typing import Dict, List
 from mcp.server.fastmcp import FastMCP
-from agora_l402.core import Agora
+from agora_l402.core import AsyncAgora
+from agora_l402.auth import CredentialManager, FileCredentialStore
+from agora_l402.cache import ResponseCache, SQLiteBackend
+from agora_l402.cassette import Cassette
+from agora_l402.images import ImageIds
+from agora_l402.payments import PaymentIntents
+from agora_l402.ratelimit import RateLimiter, SQLiteBucketStore
+from agora_l402.shape import Shaper, default_fields
+from agora_l402.tools import register_tools
+from contextlib import asynccontextmanager
 import os
 import json
 
 # Create FastMCP and Agora instances
 mcp = FastMCP("Agora E-commerce MCP Server")
-agora = Agora(api_key=os.environ.get("AGORA_API_KEY"))
-
-
-
-@mcp.tool()
-async def search_trial(query: str, price_min: int, price_max: int, sort: str, order: str) -> str:
-    """Search for products using the trial endpoint.
-
-Args:
-    query (str): Search query text
-    price_min (int, optional): Minimum price for filtering products (default: 0)
-    price_max (int, optional): Maximum price for filtering products
-    sort (str, optional): Sorting field: price:relevance
-    order (str, optional): Sorting order: asc or desc
-    
-Returns:
-    dict: Search results with products matching the query
-
-Example:
-    search_trial("shoes", [100, 1000], "price:relevance", "desc")"""
-    r = agora.search_trial(query, price_min, price_max, sort, order)
-    return r.status_code, r.text
-
-
-@mcp.tool()
-async def get_product_detail(slug: str) -> str:
-    """Retrieve detailed information about a specific product.
-
-Args:
-    slug (str): The unique identifier of the product to retrieve
-    
-Returns:
-    dict: Detailed information about the requested product
-
-Example:
-    agora.get_product_detail("calzuro-without-pistachio-eb12f468-48a2-48af-9f5e-3fda5f6c135c-1708446961787")"""
-    r = agora.get_product_detail(slug)
-    return r.status_code, r.text
-
-
-@mcp.tool()
-async def create_cart(custom_user_id: str, items: List) -> str:
-    """Create a new cart for a user.
-
-Args:
-    custom_user_id (str, optional): Unique identifier for the user
-    items (list, optional): List of items to add to the cart
-        Each item should be a dict with:
-        - variantId (int): Variant ID of the product
-        - product (int/str): Product ID
-        - quantity (int): Quantity of the product
-        
-Returns:
-    dict: Response with cart creation status
-
-Example:
-    agora.create_cart("user123", [
-        {"variantId": 123, "product": "678f71a9356a36f784ee2e88", "quantity": 1}
-    ])"""
-    r = agora.create_cart(custom_user_id, items)
-    return r.status_code, r.text
-
-
-@mcp.tool()
-async def add_to_cart(product_id: str, variant_id: str, quantity: int, custom_user_id: str) -> str:
-    """Add a product to an existing cart.
-
-Args:
-    product_id (str/int): ID of the product to add
-    variant_id (str/int): Variant ID of the product
-    quantity (int, optional): Quantity of the product (default: 1)
-    custom_user_id (str, optional): Unique identifier for the user
-    
-Returns:
-    dict: Response with cart update status
-
-Example:
-    agora.add_to_cart("678f71a9356a36f784ee2e88", "2061038485517", 2, "user123")"""
-    r = agora.add_to_cart(product_id, variant_id, quantity, custom_user_id)
-    return r.status_code, r.text
-
-
-@mcp.tool()
-async def create_order(encrypted_payment_info: str, shipping_address: Dict, current_user: Dict) -> str:
-    """Create a new order from cart items.
-
-Args:
-    encrypted_payment_info (str): Encrypted payment information
-    shipping_address (dict): Dictionary containing shipping address details:
-        - addressFirst (str): Street address
-        - city (str): City name
-        - state (str): State/province
-        - country (str): Country name
-        - addressName (str): Name associated with address
-        - zipCode (str): Postal/ZIP code
-    current_user (dict): Dictionary containing user information:
-        - firstname (str): User's first name
-        - lastname (str): User's last name
-        - email (str): User's email address
-        - _id (str): User's ID
-        
-Returns:
-    dict: Order creation response with success status and order ID
-
-Example:
-    agora.create_order(
-        "encrypted_data",
-        {
-            "addressFirst": "123 Main St",
-            "city": "New York",
-            "state": "NY",
-            "country": "US",
-            "addressName": "Home",
-            "zipCode": "10001"
-        },
-        {
-            "firstname": "John",
-            "lastname": "Doe",
-            "email": "john@example.com",
-            "_id": "user123"
-        }
-    )"""
-    r = agora.create_order(encrypted_payment_info, shipping_address, current_user)
-    return r.status_code, r.text
-
-
-@mcp.tool()
-async def track_order(order_id: str) -> str:
-    """Track an existing order by its ID.
-
-Args:
-    order_id (str): Unique identifier of the order to track
-    
-Returns:
-    dict: Detailed order information including items, status, and shipping details
-
-Example:
-    agora.track_order("67c8577b3e370f07d12c7722")"""
-    r = agora.track_order(order_id)
-    return r.status_code, r.text
-
-
-@mcp.tool()
-async def refresh_token(refresh_token_str: str) -> str:
-    """Refresh API key and token by providing a valid refresh token.
-
-Args:
-    refresh_token_str (str): The refresh token to validate and retrieve
-                           a new API key and refresh token
-    
-Returns:
-    dict: Object containing new API key, refresh token, and expiration time
-          with the following structure:
-          {
-            "status": "success",
-            "data": {
-              "apiKey": "...",
-              "refreshToken": "...",
-              "expiresAt": "..."
-            }
-          }
-
-Raises:
-    ValueError: If the refresh token is invalid or missing"""
-    r = agora.refresh_token(refresh_token_str)
-    return r.status_code, r.text
-
-
-@mcp.tool()
-async def create_payment_intent(offer_id: str, amount: int, title: str, description: str, currency: str) -> str:
-    """Create a payment intent for a product or cart.
-
-Args:
-    offer_id (str): Unique identifier for this offer (variant_id for items, user_id for carts)
-    amount (int): Payment amount in cents
-    title (str): Offer title
-    description (str): Offer description
-    currency (str, optional): Payment currency (default: USD)
-    
-Returns:
-    dict: Created payment options for product / cart.
-
-Example:
-    agora.create_payment_intent(
-        "12345",
-        1999, # 19.99 USD in cents
-        title="Altra Shoes",
-        description="Altra Escalanta v4 running shoes"
-    )"""
-    r = agora.create_payment_intent(offer_id, amount, title, description, currency)
-    return r.status_code, r.text
 
+# The worker processes of `serve.py` share the cache, rate limits, credentials, payment intents and image ids
+# through files in this directory
+state_dir = os.environ.get("AGORA_STATE_DIR")
+def _state(name): return os.path.join(state_dir, name) if state_dir else None
+
+cache = ResponseCache(backend=SQLiteBackend(_state("cache.db"))) if state_dir else None
+# e.g. `{"search/trial": [5, 10], "*": [20, 40]}`: requests per second and burst for each endpoint
+rate_limits = json.loads(os.environ.get("AGORA_RATE_LIMITS") or "null")
+rate_limiter = RateLimiter(rate_limits, SQLiteBucketStore(_state("ratelimit.db")) if state_dir else None) if rate_limits else None
+
+# With a refresh token the API key is renewed before it expires, and shared through the credentials file if set
+credentials_file = os.environ.get("AGORA_CREDENTIALS_FILE") or _state("credentials.json")
+credentials = CredentialManager(os.environ.get("AGORA_REFRESH_TOKEN"),
+                                store=FileCredentialStore(credentials_file) if credentials_file else None)
+# For evals: record the API responses to a cassette file, or replay them without the network
+cassette_file = os.environ.get("AGORA_CASSETTE")
+cassette = Cassette(cassette_file, os.environ.get("AGORA_CASSETTE_MODE", "auto")) if cassette_file else None
+# Agents send images as `data:` URLs. Files are only read from `AGORA_IMAGE_DIR`, if set, so a tool call can't upload
+# any file the server can read.
+images = ImageIds(backend=SQLiteBackend(_state("images.db")) if state_dir else None,
+                  paths=os.environ.get("AGORA_IMAGE_DIR") or False)
+# A retried checkout gets the payment intent created the first time, whichever worker created it
+payments = PaymentIntents(backend=SQLiteBackend(_state("payments.db"))) if state_dir else None
+# The products of every search and product detail are indexed, so `local_search` can refine searches locally. The
+# tool output is then shaped from those products. With `AGORA_MCP_INDEX=0`, search pages are only parsed as far as
+# the output needs, and `local_search` always searches upstream.
+# Orders and carts get their own concurrency limit, and searches are shed first when the server is overloaded.
+index = os.environ.get("AGORA_MCP_INDEX", "1") != "0"
+agora = AsyncAgora(api_key=os.environ.get("AGORA_API_KEY"), cache=cache, rate_limiter=rate_limiter, credentials=credentials,
+                   index=index, cassette=cassette, scheduler=True, images=images, payments=payments)
+
+# Tool outputs are cut down to the fields and size an agent needs
+shape = Shaper(fields=os.environ.get("AGORA_MCP_FIELDS", ",".join(default_fields)).split(","),
+               max_tokens=int(os.environ.get("AGORA_MCP_MAX_TOKENS", 4000)))
+
+def _tool_result(r):
+    "Compact JSON of a tool result"
+    return json.dumps(shape(r), separators=(",", ":"), ensure_ascii=False)
+
+# One tool per method in `agora.as_tools()` (plus `stats`), built from the installed library. Each call
+# runs within the `deadline` the agent passes, or `AGORA_MCP_DEADLINE` seconds, down to its HTTP timeouts and retries.
+deadline = os.environ.get("AGORA_MCP_DEADLINE")
+register_tools(mcp, agora, result=_tool_result, deadline=float(deadline) if deadline else None)
+
+def http_app():
+    "ASGI app of the server over HTTP, created in each worker by `serve.py`"
+    if os.environ.get("AGORA_MCP_TRANSPORT") == "sse": app = mcp.sse_app()
+    else:
+        # Without sessions, any worker can answer any request
+        mcp.settings.stateless_http = mcp.settings.json_response = True
+        app = mcp.streamable_http_app()
+    serve = app.router.lifespan_context
+    @asynccontextmanager
+    async def lifespan(app):
+        async with serve(app): yield
+        # On shutdown, orders and payments still in flight finish before the connections close
+        await agora.aclose(timeout=float(os.environ.get("AGORA_DRAIN_TIMEOUT", 30)))
+    app.router.lifespan_context = lifespan
+    return app
 
 if __name__ == "__main__":
     mcp.run()
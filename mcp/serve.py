@@ -0,0 +1,43 @@
+"""Serve the Agora MCP tools over HTTP from several worker processes listening on one port.
+
+    python serve.py --workers 4 --port 8000
+
+Clients connect to `http://HOST:PORT/mcp` (streamable HTTP). The workers share the response cache,
+the rate limits, the credentials, the payment intents and the image ids through the files in
+`--state-dir`. Local carts, the product index and order watches stay in each worker: run a single
+worker for clients that rely on `local_cart`, `local_search` or `watch_orders`. On SIGTERM or Ctrl-C
+the workers stop accepting connections and finish the calls in flight, orders and payments included,
+before exiting.
+"""
+from pathlib import Path
+import argparse
+import os
+import tempfile
+import uvicorn
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--workers", type=int,
+                   help="worker processes (default: 4, or 1 with sse); local_cart, local_search and watch_orders only see their own worker")
+    p.add_argument("--transport", choices=["streamable-http", "sse"], default="streamable-http",
+                   help="sse keeps a session per client in one process, so it runs a single worker")
+    p.add_argument("--state-dir", default=os.environ.get("AGORA_STATE_DIR"),
+                   help="directory of the shared cache, rate limit, credential, payment and image files (default: a new temporary one)")
+    p.add_argument("--drain-timeout", type=int, default=30, help="seconds to wait for the calls in flight on shutdown")
+    args = p.parse_args()
+    if args.workers is None: args.workers = 1 if args.transport == "sse" else 4
+    if args.transport == "sse" and args.workers > 1: p.error("--transport sse runs a single worker")
+
+    # The workers are spawned with this environment, and `main.py` reads its settings from it
+    state_dir = args.state_dir or tempfile.mkdtemp(prefix="agora-mcp-")
+    os.makedirs(state_dir, exist_ok=True)
+    os.environ.update(AGORA_STATE_DIR=state_dir, AGORA_MCP_TRANSPORT=args.transport,
+                      AGORA_DRAIN_TIMEOUT=str(args.drain_timeout))
+    # uvicorn binds the socket once and the workers accept from it, so the port is shared
+    uvicorn.run("main:http_app", factory=True, app_dir=str(Path(__file__).parent), host=args.host, port=args.port,
+                workers=args.workers, timeout_graceful_shutdown=args.drain_timeout, log_level="warning")
+
+if __name__ == "__main__":
+    main()